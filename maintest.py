@@ -1,108 +1,87 @@
-from mazegenerator_2_copy import mazegenerate
 import tkinter as tk
 from tkinter import messagebox
-from PIL import ImageTk, Image
-from something_copy import solvemaze
+from PIL import ImageTk
+from mazesolvers import UNSEEN, ORIGIN
+from mazecore import DI, DJ, UP, DOWN, LEFT, RIGHT
+from mazerender import RED, GREEN
+from mazepath import MazePath
+from mazecache import MazeCache
+from mazeworker import Job, Token, generatework, solvework
+from mazeview import MazeView, GREY
+import collections
+import itertools
+import os
 import time
+import numpy as np
 
-gg = False
+work = None  #the Job or Token of whatever is running, cancelled by the home screen
 n = 0
-f = []  #Unessary overhead... but also necessary
+seed = None  #mazes with a seed are kept in the cache so asking again loads them instead of regenerating
+cache = MazeCache(os.path.join(os.path.dirname(os.path.abspath(__file__)), "mazecache"))
+f = []  #[MazeView, Maze] of the maze on screen
 x = 1  #j in image
 y = 1  #i in image
+trail = {(1, 1)}  #pixels the player has painted red
+board = None  #canvas showing the maze, made in show()
+zoom = 1.0  #screen pixels per image pixel
+pan = [0.0, 0.0]  #image pixels the view has been dragged away from the player, back to 0 when the player moves
+grab = None  #screen point the drag started from
+MAXSIZE = 10000  #biggest maze the GUI takes, only the part of it on screen is ever drawn
+ZOOMSTEP = 2 ** 0.25  #one key press or wheel notch
+MAXZOOM = 64
+STARTZOOM = 4  #a bigger maze than fits at this zoom starts zoomed in on the player
+FRAME = 16  #milliseconds between animation frames
+INSTANT = 16  #top of the speed slider, 2 ** 16 steps per frame below it
+SLICE = 1024  #steps between clock checks when running instantly
+BLOCK = 1 << 22  #cells finish() looks at per numpy pass
 
 
 #also add protection for when home screen is clicked when maze is being solved - Done
 #Add mazesolver button
 
-def left(event):
-    #edit image and display(update)
-    global x
-    x = x - 1
-    r, g, b = f[0].getpixel((x, y))
-    #also add check to see if pixel is black, cant have the pointer overriding walls
+def canmove(x, y, d):
+    #walls come from the maze itself, (x, y) is an image pixel: cells sit on odd x and y,
+    #the pixels between them are passages that can only be walked along
+    if x % 2 and y % 2:
+        return f[1].isopen(y // 2, x // 2, d)
+    return (x % 2 == 0) == (DJ[d] != 0)
+
+
+def move(d):
+    #the player leaves a red trail, stepping back onto it rubs out the pixel just left
+    global x, y
+    if not f or not canmove(x, y, d):
+        return
+    x = x + DJ[d]
+    y = y + DI[d]
     if x == n * 2 - 1 and y == n * 2 - 1:
         messagebox.showinfo("Congrats!", "Congrats on completing the maze!!")
         root.focus_set()
         return
-    if r == 0 and g == 0 and b == 0:
-        x = x + 1
-        return
-    if g == 255:
-        f[0].putpixel((x, y), (255, 0, 0))
+    if (x, y) in trail:
+        trail.discard((x - DJ[d], y - DI[d]))
+        f[0].paint([(x - DJ[d], y - DI[d])], None)  #back to the maze underneath
     else:
-        f[0].putpixel((x + 1, y), (255, 255, 255))
-    global image_label1
-    new_image = ImageTk.PhotoImage(
-        f[0].resize((root.winfo_screenheight() - 90, root.winfo_screenheight() - 90), Image.NONE))
-    image_label1.config(image=new_image)  #config doesnt exist?
-    image_label1.image = new_image
+        trail.add((x, y))
+        f[0].paint([(x, y)], RED)
+    pan[0] = pan[1] = 0.0
+    update_image()
+
+
+def left(event):
+    move(LEFT)
 
 
 def right(event):
-    global x
-    x = x + 1
-    if x == n * 2 - 1 and y == n * 2 - 1:
-        messagebox.showinfo("Congrats!", "Congrats on completing the maze!!")
-        root.focus_set()
-        return
-    r, g, b = f[0].getpixel((x, y))
-    if r == 0 and g == 0 and b == 0:
-        x = x - 1
-        return
-    if g == 255:
-        f[0].putpixel((x, y), (255, 0, 0))
-    else:
-        f[0].putpixel((x - 1, y), (255, 255, 255))
-    global image_label1
-    new_image = ImageTk.PhotoImage(
-        f[0].resize((root.winfo_screenheight() - 90, root.winfo_screenheight() - 90), Image.NONE))
-    image_label1.config(image=new_image)  # config doesnt exist?
-    image_label1.image = new_image
+    move(RIGHT)
 
 
 def up(event):
-    global y
-    y = y - 1
-    if x == n * 2 - 1 and y == n * 2 - 1:
-        messagebox.showinfo("Congrats!", "Congrats on completing the maze!!")
-        root.focus_set()
-        return
-    r, g, b = f[0].getpixel((x, y))
-    if r == 0 and g == 0 and b == 0:
-        y = y + 1
-        return
-    if g == 255:
-        f[0].putpixel((x, y), (255, 0, 0))
-    else:
-        f[0].putpixel((x, y + 1), (255, 255, 255))
-    global image_label1
-    new_image = ImageTk.PhotoImage(
-        f[0].resize((root.winfo_screenheight() - 90, root.winfo_screenheight() - 90), Image.NONE))
-    image_label1.config(image=new_image)  # config doesnt exist?
-    image_label1.image = new_image
+    move(UP)
 
 
 def down(event):
-    global y
-    y = y + 1
-    if x == n * 2 - 1 and y == n * 2 - 1:
-        messagebox.showinfo("Congrats!", "Congrats on completing the maze!!")
-        root.focus_set()
-        return
-    r, g, b = f[0].getpixel((x, y))
-    if r == 0 and g == 0 and b == 0:
-        y = y - 1
-        return
-    if g == 255:
-        f[0].putpixel((x, y), (255, 0, 0))
-    else:
-        f[0].putpixel((x, y - 1), (255, 255, 255))
-    global image_label1
-    new_image = ImageTk.PhotoImage(
-        f[0].resize((root.winfo_screenheight() - 90, root.winfo_screenheight() - 90), Image.NONE))
-    image_label1.config(image=new_image)  # config doesnt exist?
-    image_label1.image = new_image
+    move(DOWN)
 
 
 '''def solvemaze3():
@@ -225,48 +204,78 @@ def sample():
         messagebox.showerror("Input First",
                              "Before trying to generate a maze, enter the dimensions of the square maze in the textbox above")
         return
+    global work
     generatorframe.focus_set()
+    mazesolver1.config(command=placeholder)
+    mazesolver2.config(command=placeholder)
+    entryframe.grid_forget()
+    generatorframe.grid(row=0, column=0, sticky="nsew")  #row configuration and all must be done here
+    #the maze is made in another process, the home screen button works while it is
+    work = Job(generatework, n, seed, cache)
+    wait(work, generated)
+
+
+def generated(maze):
+    global f
     mazesolver1.config(command=solvemaze1)
     mazesolver2.config(command=solvemaze2)
    # mazesolver3.config(command=solvemaze3)
-    global f
-    f = mazegenerate(n)  #unadultrated image
+    f = [MazeView(maze), maze]  #the view builds the bits of the image it shows, never the whole of it
     #f[0].show()
     #for p in range(40):  # make number larger for more prescision
     #   entryframe.grid_rowconfigure(p, weight=1)
     #for p in range(40):
     #   entryframe.grid_columnconfigure(p, weight=1)
-    global image_label1
-    new_image = ImageTk.PhotoImage(
-        f[0].resize((root.winfo_screenheight() - 90, root.winfo_screenheight() - 90), Image.NONE))
-    image_label1 = tk.Label(generatorframe, image=new_image)
-    image_label1.image = new_image  #this thing fixed the code
-    del new_image
-    image_label1.grid(row=0, column=0, padx=1, pady=1)
-    entryframe.grid_forget()
-    generatorframe.grid(row=0, column=0, sticky="nsew")  #row configuration and all must be done here
+    show()
+
+
+def wait(job, done):
+    #checks on job every frame, shows how it is getting on and calls done(result) once it has finished
+    if job.cancelled:
+        return
+    for kind, value in job.poll():
+        if kind == "done":
+            status.config(text="")
+            done(value)
+            return
+        if kind == "error":
+            status.config(text="")
+            messagebox.showerror("Failed", value)
+            return
+    status.config(text="%s... %.1fs" % (job.text, job.elapsed))
+    root.after(FRAME, wait, job, done)
 
 
 def submit():
-    global n
+    global n, seed
     try:
         n = int(entry.get())
-        if n < 3 or n > 115:  #maybe move the number check to sample, as would want to take in bigger numbers for mazesolver (random maze solution)
-            messagebox.showerror("Invalid Input", "Please input a number in the range of 3 to 115 (inclusive)")
+        if n < 3 or n > MAXSIZE:
+            messagebox.showerror("Invalid Input", "Please input a number in the range of 3 to %d (inclusive)" % MAXSIZE)
             n = 0
     except ValueError:
         messagebox.showerror("Invalid Input", "Please input a number using only the number characters")
         n = 0
     entry.delete(0, tk.END)
+    try:
+        seed = int(seedentry.get()) if seedentry.get().strip() else None  #empty means a new random maze every time
+    except ValueError:
+        messagebox.showerror("Invalid Input", "The seed has to be a whole number, or left empty for a random maze")
+        seed = None
 
 
 def Backgenerator():
-    global x, y, gg
+    global x, y, trail, work, board
     x = 1
     y = 1
-    if gg:
-        gg = False
-        time.sleep(0.25)
+    trail = {(1, 1)}
+    if work is not None:
+        work.cancel()  #stops generating or solving straight away
+        work = None
+    if board is not None:
+        board.destroy()
+        board = None
+    status.config(text="")
     generatorframe.grid_forget()
     entryframe.grid(sticky="nsew")
     mazegeneratorbutton.grid(row=20, column=0, padx=0, pady=0)
@@ -274,260 +283,268 @@ def Backgenerator():
     entry.grid(row=19, column=1, padx=0, pady=0)
     global f
     f = []
-    #have to stop it solving if it is... somehow
+
+
+def explore(maze, came, grey):
+    #the animated depth first search as a generator, one step per pixel it colours: yields (x, y, colour).
+    #came marks every cell it entered, grey the forks it backed out to
+    i = 0
+    j = 0
+    forkprocessor = []  #forks on the current route that still have unexplored exits
+
+    def unexplored(i, j):
+        return [d for d in maze.exits(i, j) if came[maze.index(i + DI[d], j + DJ[d])] == UNSEEN]
+
+    while not (i == maze.rows - 1 and j == maze.cols - 1):
+        yield j + j + 1, i + i + 1, GREEN
+        arr = unexplored(i, j)
+        if len(arr) == 0:
+            #dead end, go back to the last fork that still has somewhere to go
+            while True:
+                i, j = forkprocessor[-1]
+                arr = unexplored(i, j)
+                if len(arr) <= 1:
+                    forkprocessor.pop()
+                if len(arr) > 0:
+                    break
+            grey[maze.index(i, j)] = 1
+            yield j + j + 1, i + i + 1, GREY
+        elif len(arr) > 1:
+            forkprocessor.append((i, j))
+        d = arr[0]
+        yield j + j + 1 + DJ[d], i + i + 1 + DI[d], GREEN
+        i = i + DI[d]
+        j = j + DJ[d]
+        came[maze.index(i, j)] = d
+
+
+def stepsperframe():
+    #None means as fast as possible, the whole search in one frame
+    v = speed.get()
+    return None if v >= INSTANT else 2 ** v
+
+
+def speedchanged(value):
+    v = int(value)
+    speed.config(label="instant" if v >= INSTANT else str(2 ** v) + " steps per frame")
 
 
 def solvemaze1():
-    #solve maze in green
-    global gg
-    gg = True
+    #solve maze in green, a few steps every frame so the window keeps responding
+    global work
+    token = work = Token()
     root.focus_set()
-    #f[0] = solvemaze(f[1], f[0])  #maze,image
-    #update_image()
     mazesolver1.config(command=placeholder)
     mazesolver2.config(command=placeholder)
     #mazesolver3.config(command=placeholder)
-    i = 0
-    j = 0
-    forkprocessor = []
-    path = []
-    maze = f[1]
-    f.pop()
-    while not (i == len(maze) - 1 and j == len(
-            maze) - 1):  # make while true loop and have condition in here to break; and to add to incomplete path
-        # print(i, j)
-        # print("path = ", path)
-        # print(forkprocessor)
-        # print(i,j)
-        #time.sleep(0.025)
-        if not gg:
+    maze = f[1]  #kept in f, the player still needs its walls
+    came = bytearray([UNSEEN]) * maze.size  #direction each cell was entered from
+    came[0] = ORIGIN
+    grey = bytearray(maze.size)
+    steps = explore(maze, came, grey)
+
+    def frame():
+        if token.cancelled:
+            return  #home screen was pressed
+        budget = stepsperframe()
+        if budget is None:
+            #nothing is painted until finish() draws the final colours in one go, but the search still
+            #only runs for a frame's worth of time at once so the window (and the home screen button) works
+            deadline = time.perf_counter() + FRAME / 1000
+            while time.perf_counter() < deadline:
+                collections.deque(itertools.islice(steps, SLICE), maxlen=0)
+                if next(steps, None) is None:
+                    finish(maze, came, grey, token)
+                    return
+            root.after(FRAME, frame)
             return
-        f[0].putpixel((j + j + 1, i + i + 1), (0, 255, 0))
-        update_image()
-        root.update_idletasks()
-        root.update()
-        if maze[i][j][0] == -2:
-            i = forkprocessor[len(forkprocessor) - 3]
-            j = forkprocessor[len(forkprocessor) - 2]
-            # print("Reached dead end, coordinates of previous viable fork are", i, j)
-            # print("This is path", path)
-            while not (i == path[len(path) - 3] and j == path[
-                len(path) - 2]):  # POPs path if i and j values are not equal; previous fork
-                # print("Removing last fork from path as all paths from that one have been explored")
-                path.pop()
-                path.pop()
-                path.pop()
-            #  print("done,",path)
-            if forkprocessor[len(forkprocessor) - 1]:  # ==True
-                f[0].putpixel((j + j + 1, i + i + 1), (100, 100, 100))
-                update_image()
-                path.pop()
-                path.append(maze[i][j][1])
-                if len(maze[i][j]) == 2:
-                    # print("Trying to POP forkprocessor",forkprocessor)
-                    forkprocessor.pop()
-                    forkprocessor.pop()
-                    forkprocessor.pop()
-                    # print("done?",forkprocessor)
-                else:
-                    forkprocessor[len(forkprocessor) - 1] = False
-                if maze[i][j][1] == 0:
-                    f[0].putpixel((j + j + 1, i + i), (0, 255, 0))
-                    update_image()
-                    i = i - 1
-                elif maze[i][j][1] == 1:
-                    f[0].putpixel((j + j + 1, i + i + 2), (0, 255, 0))
-                    update_image()
-                    i = i + 1
-                elif maze[i][j][1] == 3:
-                    f[0].putpixel((j + j + 2, i + i + 1), (0, 255, 0))
-                    update_image()
-                    j = j + 1
-                else:
-                    f[0].putpixel((j + j, i + i + 1), (0, 255, 0))
-                    update_image()
-                    j = j - 1
-                root.update_idletasks()
-                root.update()
-            else:
-                f[0].putpixel((j + j + 1, i + i + 1), (150, 150, 150))
-                update_image()
-                path.pop()
-                path.append(maze[i][j][2])
-                forkprocessor.pop()
-                forkprocessor.pop()
-                forkprocessor.pop()
-                if maze[i][j][2] == 0:
-                    f[0].putpixel((j + j + 1, i + i), (0, 255, 0))
-                    update_image()
-                    i = i - 1
-                elif maze[i][j][2] == 1:
-                    f[0].putpixel((j + j + 1, i + i + 2), (0, 255, 0))
-                    update_image()
-                    i = i + 1
-                elif maze[i][j][2] == 3:
-                    f[0].putpixel((j + j + 2, i + i + 1), (0, 255, 0))
-                    update_image()
-                    j = j + 1
-                else:
-                    f[0].putpixel((j + j, i + i + 1), (0, 255, 0))
-                    update_image()
-                    j = j - 1
-                root.update_idletasks()
-                root.update()
-            continue
-
-        if len(maze[i][j]) == 1:
-            if maze[i][j][0] == 0:
-                f[0].putpixel((j + j + 1, i + i), (0, 255, 0))
-                update_image()
-                i = i - 1
-            elif maze[i][j][0] == 1:
-                f[0].putpixel((j + j + 1, i + i + 2), (0, 255, 0))
-                update_image()
-                i = i + 1
-            elif maze[i][j][0] == 3:
-                f[0].putpixel((j + j + 2, i + i + 1), (0, 255, 0))
-                update_image()
-                j = j + 1
-            else:
-                f[0].putpixel((j + j, i + i + 1), (0, 255, 0))
-                update_image()
-                j = j - 1
-            root.update_idletasks()
-            root.update()
-
-        else:
-            # print("found fork at ", i, j)
-            path.append(i)
-            path.append(j)
-            path.append(maze[i][j][0])
-            # print("New path = ", path)
-            forkprocessor.append(i)
-            forkprocessor.append(j)
-            forkprocessor.append(
-                True)  # second path - true. then remove it based on the length. else third path, and remove it immediately
-            if maze[i][j][0] == 0:
-                f[0].putpixel((j + j + 1, i + i), (0, 255, 0))
-                update_image()
-                i = i - 1
-            elif maze[i][j][0] == 1:
-                f[0].putpixel((j + j + 1, i + i + 2), (0, 255, 0))
-                update_image()
-                i = i + 1
-            elif maze[i][j][0] == 3:
-                f[0].putpixel((j + j + 2, i + i + 1), (0, 255, 0))
-                update_image()
-                j = j + 1
-            else:
-                f[0].putpixel((j + j, i + i + 1), (0, 255, 0))
-                update_image()
-                j = j - 1
-            root.update_idletasks()
-            root.update()
-    for i in range(len(path) - 1, -1, -1):
-        if not ((i + 1) % 3 == 0):
-            path.pop(i)
-
-    #global n
-    gh = f[0].size[0]
-    for i in range(0, gh):
-        for j in range(0, gh):
-            r, g = f[0].getpixel((j, i))[:2]
-            if r == 0 and (not g == 0):
-                f[0].putpixel((j, i), (255, 255, 255))
-    i = 0
-    j = 0
-    while not (i == len(maze) - 1 and j == len(maze) - 1):
-        f[0].putpixel((j + j + 1, i + i + 1), (0, 255, 0))
-        if len(maze[i][j]) == 1:
-            if maze[i][j][0] == 0:
-                f[0].putpixel((j + j + 1, i + i), (0, 255, 0))
-                i = i - 1
-            elif maze[i][j][0] == 1:
-                f[0].putpixel((j + j + 1, i + i + 2), (0, 255, 0))
-                i = i + 1
-            elif maze[i][j][0] == 3:
-                f[0].putpixel((j + j + 2, i + i + 1), (0, 255, 0))
-                j = j + 1
-            else:
-                f[0].putpixel((j + j, i + i + 1), (0, 255, 0))
-                j = j - 1
+        dirty = {}  #each pixel is painted once per frame, with the last colour it was given
+        for x, y, colour in itertools.islice(steps, budget):
+            dirty[x, y] = colour
+        for colour in (GREEN, GREY):
+            f[0].paint([p for p, c in dirty.items() if c == colour], colour)
+        if len(dirty) == 0:
+            finish(maze, came, grey, token)
         else:
-            f[0].putpixel((j + j + 1, i + i + 1), (0, 255, 0))
-            if path[0] == 0:
-                f[0].putpixel((j + j + 1, i + i), (0, 255, 0))
-                i = i - 1
-            elif path[0] == 1:
-                f[0].putpixel((j + j + 1, i + i + 2), (0, 255, 0))
-                i = i + 1
-            elif path[0] == 3:
-                f[0].putpixel((j + j + 2, i + i + 1), (0, 255, 0))
-                j = j + 1
-            else:
-                f[0].putpixel((j + j, i + i + 1), (0, 255, 0))
-                j = j - 1
-            path.pop(0)
+            update_image()
+            root.after(FRAME, frame)
+
+    frame()
+
+
+def finish(maze, came, grey, token):
+    #rubs out the green the search left and draws the route it found, only the explored pixels are touched:
+    #every cell came marks and the passage it was entered through. The forks it backed out to stay grey
+    global work
+    came = np.frombuffer(came, dtype=np.uint8)
+    grey = np.frombuffer(grey, dtype=np.uint8)
+    di, dj = np.array(DI), np.array(DJ)
+    for k0 in range(0, maze.size, BLOCK):
+        k = np.flatnonzero(came[k0:k0 + BLOCK] != UNSEEN) + k0
+        i, j = np.divmod(k, maze.cols)
+        x, y = j * 2 + 1, i * 2 + 1
+        d = came[k]
+        entered = d != ORIGIN
+        f[0].paint(np.column_stack((x, y)), None)
+        f[0].paint(np.column_stack((x[entered] - dj[d[entered]], y[entered] - di[d[entered]])), None)
+        dead = grey[k] != 0
+        f[0].paint(np.column_stack((x[dead], y[dead])), GREY)
+    f[0].drawpath(MazePath.fromcame(maze, came, maze.index(maze.rows - 1, maze.cols - 1)).cells())
     update_image()
-    gg = False
+    if work is token:
+        work = None
 
 
 def placeholder():
     messagebox.showinfo("Nah", "No you dont")
 
 
+def show():
+    #a square canvas looking at part of the maze, it starts showing the whole maze unless that would make
+    #the cells too small to walk through, then it starts zoomed in on the player
+    global board, zoom
+    side = root.winfo_screenheight() - 90
+    fit = side / max(f[0].width, f[0].height)
+    zoom = max(fit, STARTZOOM)
+    pan[0] = pan[1] = 0.0
+    if board is not None:
+        board.destroy()
+    board = tk.Canvas(generatorframe, width=side, height=side, bg="black", highlightthickness=0)
+    board.grid(row=0, column=0, padx=1, pady=1)
+    board.side = side
+    board.create_image(0, 0, anchor="nw", tags="maze")
+    board.bind("<ButtonPress-1>", startdrag)
+    board.bind("<B1-Motion>", drag)
+    board.bind("<MouseWheel>", wheel)  #Windows and macOS
+    board.bind("<Button-4>", wheel)  #X11 sends the wheel as buttons 4 and 5
+    board.bind("<Button-5>", wheel)
+    update_image()
+
+
+def centre(position, length, half):
+    #the view follows the player, a maze narrower than the screen stays in the middle of it
+    if length <= 2 * half:
+        return length / 2
+    return position
+
+
 def update_image():
-    global image_label1
-    new_image = ImageTk.PhotoImage(
-        f[0].resize((root.winfo_screenheight() - 90, root.winfo_screenheight() - 90), Image.NONE))
-    image_label1.config(image=new_image)  # config doesnt exist?
-    image_label1.image = new_image
+    #draws what the canvas can see: only the tiles under it, from the pyramid level nearest the zoom
+    half = board.side / 2 / zoom
+    cx = centre(x + 0.5 + pan[0], f[0].width, half)
+    cy = centre(y + 0.5 + pan[1], f[0].height, half)
+    board.photo = ImageTk.PhotoImage(f[0].render(cx, cy, zoom, board.side, board.side))
+    board.itemconfig("maze", image=board.photo)
+
+
+def setzoom(factor):
+    #never smaller than a quarter of the screen, never more than MAXZOOM screen pixels per image pixel
+    global zoom
+    if not f or board is None:
+        return
+    least = board.side / max(f[0].width, f[0].height) / 4
+    zoom = min(MAXZOOM, max(least, zoom * factor))
+    update_image()
+
+
+def zoomin(event):
+    setzoom(ZOOMSTEP)
+
+
+def zoomout(event):
+    setzoom(1 / ZOOMSTEP)
+
+
+def wheel(event):
+    setzoom(ZOOMSTEP if event.num == 4 or event.delta > 0 else 1 / ZOOMSTEP)
+
+
+def startdrag(event):
+    global grab
+    grab = (event.x, event.y)
+    generatorframe.focus_set()  #clicking the canvas must not lose the arrow keys
+
+
+def drag(event):
+    #the maze moves with the mouse, so the view goes the other way
+    global grab
+    if grab is None or not f:
+        return
+    pan[0] -= (event.x - grab[0]) / zoom
+    pan[1] -= (event.y - grab[1]) / zoom
+    grab = (event.x, event.y)
+    update_image()
 
 
 def solvemaze2():
+    global work
     root.focus_set()
     mazesolver1.config(command=placeholder)
     mazesolver2.config(command=placeholder)
     #mazesolver3.config(command=placeholder)
-    f[0] = solvemaze(f[1], f[0])
+    #the spanning tree from generation turns solving into a walk from the goal back to the start
+    work = Job(solvework, f[1], "tree" if f[1].tree is not None else "dfs")
+    wait(work, solved)
+
+
+def solved(path):
+    global work
+    work = None
+    if path is not None:
+        f[0].drawpath(path.cells())
     update_image()
 
 
-root = tk.Tk()
-root.configure(bg='black')
-root.title("Maze generator and solver")
-entryframe = tk.Frame(root, bg='black')
-entryframe.grid(row=0, column=0, sticky="nsew")
-for p in range(40):  #make number larger for more prescision
-    entryframe.grid_rowconfigure(p, weight=1)
-for p in range(40):
-    entryframe.grid_columnconfigure(p, weight=1)
-mazegeneratorbutton = tk.Button(entryframe, text="Mazegenerator", command=sample, width=15, height=2)
-mazegeneratorbutton.grid(row=20, column=0, padx=0, pady=0)
-label = tk.Label(entryframe, text="dimensions of the maze = ")
-label.grid(row=19, column=0, padx=0, pady=0)
-entry = tk.Entry(entryframe)
-entry.grid(row=19, column=1, padx=0, pady=0)
-submit = tk.Button(entryframe, text="Submit", command=submit)
-submit.grid(row=19, column=2, padx=0, pady=0)
-root.grid_rowconfigure(0, weight=1)
-root.grid_columnconfigure(0, weight=1)
-generatorframe = tk.Frame(root, bg="black")
-image_label1: tk.Label  #just doing this so that its a global variabke
-generatorframe.bind("<Left>", left)
-generatorframe.bind("<Right>", right)
-generatorframe.bind("<Up>", up)
-generatorframe.bind("<Down>", down)
-#row and column configuration of generatorframe used to be here
-Back1 = tk.Button(generatorframe, text="Home screen", command=Backgenerator, width=15, height=3)
-mazesolver1 = tk.Button(generatorframe, text="Solve the maze and see what the algorithm is doing", width=40, height=4)
-mazesolver2 = tk.Button(generatorframe, text="Solve the maze fast", width=15, height=3)
-#mazesolver3 = tk.Button(generatorframe, text="A*", width=4, height=2)
-Back1.grid(row=0, column=2, padx=10, pady=10)  # move this to sample
-mazesolver1.grid(row=0, column=5, padx=10, pady=10)  # move this to sample
-#mazesolver3.grid(row=0, column=6, padx=8, pady=8)
-mazesolver2.grid(row=0, column=7, padx=10, pady=10)  # move this to sample
-root.grid_rowconfigure(0, weight=1)
-root.grid_columnconfigure(0, weight=1)
-root.geometry(str(root.winfo_screenwidth()) + "x" + str(root.winfo_screenheight()))
-root.mainloop()
+if __name__ == "__main__":  #worker processes import this file too, they must not open a window
+    root = tk.Tk()
+    root.configure(bg='black')
+    root.title("Maze generator and solver")
+    entryframe = tk.Frame(root, bg='black')
+    entryframe.grid(row=0, column=0, sticky="nsew")
+    for p in range(40):  #make number larger for more prescision
+        entryframe.grid_rowconfigure(p, weight=1)
+    for p in range(40):
+        entryframe.grid_columnconfigure(p, weight=1)
+    mazegeneratorbutton = tk.Button(entryframe, text="Mazegenerator", command=sample, width=15, height=2)
+    mazegeneratorbutton.grid(row=20, column=0, padx=0, pady=0)
+    label = tk.Label(entryframe, text="dimensions of the maze = ")
+    label.grid(row=19, column=0, padx=0, pady=0)
+    entry = tk.Entry(entryframe)
+    entry.grid(row=19, column=1, padx=0, pady=0)
+    seedlabel = tk.Label(entryframe, text="seed (optional) = ")
+    seedlabel.grid(row=18, column=0, padx=0, pady=0)
+    seedentry = tk.Entry(entryframe)
+    seedentry.grid(row=18, column=1, padx=0, pady=0)
+    submit = tk.Button(entryframe, text="Submit", command=submit)
+    submit.grid(row=19, column=2, padx=0, pady=0)
+    root.grid_rowconfigure(0, weight=1)
+    root.grid_columnconfigure(0, weight=1)
+    generatorframe = tk.Frame(root, bg="black")
+    generatorframe.bind("<Left>", left)
+    generatorframe.bind("<Right>", right)
+    generatorframe.bind("<Up>", up)
+    generatorframe.bind("<Down>", down)
+    for key in ("<plus>", "<equal>", "<KP_Add>"):
+        generatorframe.bind(key, zoomin)
+    for key in ("<minus>", "<KP_Subtract>"):
+        generatorframe.bind(key, zoomout)
+    #row and column configuration of generatorframe used to be here
+    Back1 = tk.Button(generatorframe, text="Home screen", command=Backgenerator, width=15, height=3)
+    mazesolver1 = tk.Button(generatorframe, text="Solve the maze and see what the algorithm is doing", width=40, height=4)
+    mazesolver2 = tk.Button(generatorframe, text="Solve the maze fast", width=15, height=3)
+    #mazesolver3 = tk.Button(generatorframe, text="A*", width=4, height=2)
+    Back1.grid(row=0, column=2, padx=10, pady=10)  # move this to sample
+    mazesolver1.grid(row=0, column=5, padx=10, pady=10)  # move this to sample
+    #mazesolver3.grid(row=0, column=6, padx=8, pady=8)
+    mazesolver2.grid(row=0, column=7, padx=10, pady=10)  # move this to sample
+    speed = tk.Scale(generatorframe, from_=0, to=INSTANT, orient="horizontal", showvalue=False, length=200,
+                     command=speedchanged)
+    speed.set(0)
+    speedchanged(0)
+    speed.grid(row=1, column=5, padx=10, pady=10)
+    status = tk.Label(generatorframe, text="", bg="black", fg="white")
+    status.grid(row=1, column=2, padx=10, pady=10)
+    root.grid_rowconfigure(0, weight=1)
+    root.grid_columnconfigure(0, weight=1)
+    root.geometry(str(root.winfo_screenwidth()) + "x" + str(root.winfo_screenheight()))
+    root.mainloop()
@@ -0,0 +1,378 @@
+from array import array
+
+import numpy as np
+
+from mazecore import UP, DOWN, LEFT, RIGHT, WALLS, OPPOSITE
+
+#Every generator takes an all-walls Maze and a random source (the random module or a random.Random)
+#and carves a perfect maze into it in place. "cells" below means rows * cols.
+#Generators in TREEGENERATORS grow their maze outwards from the start, if maze.tree is an array they
+#also record the spanning tree into it as they carve (see Maze.tree), for free.
+#Every generator also takes an optional progress(done, total), called about every PROGRESS cells with
+#how many of the total cells are part of the maze so far.
+
+GENERATORS = {}
+TREEGENERATORS = {"dfs", "prim"}
+PROGRESS = 1 << 16
+
+
+def register(name):
+    def wrap(func):
+        GENERATORS[name] = func
+        return func
+    return wrap
+
+
+def getgenerator(name):
+    try:
+        return GENERATORS[name]
+    except KeyError:
+        raise ValueError("Unknown maze algorithm " + repr(name) + ", pick one of " + ", ".join(sorted(GENERATORS)))
+
+
+@register("dfs")
+def dfs(maze, rng, progress=None):
+    """
+    Randomized depth first search (recursive backtracker) from the start cell.
+    Time O(cells). Memory one byte per cell for visited plus a 4 byte per cell worst case route stack.
+    Long winding corridors with few junctions.
+    """
+    rows, cols = maze.rows, maze.cols
+    visited = bytearray(rows * cols)
+    tree = None if maze.tree is None else memoryview(maze.tree)
+    k = maze.index(*maze.start)
+    stack = array('i', [k])  #flat indices of the current route
+    visited[k] = 1
+    carved = 1
+    report = PROGRESS if progress is not None else -1
+    while stack:
+        k = stack[-1]
+        i, j = divmod(k, cols)
+        arr = []  #unvisited neighbours
+        if j - 1 >= 0 and not visited[k - 1]:
+            arr.append(LEFT)
+        if j + 1 < cols and not visited[k + 1]:
+            arr.append(RIGHT)
+        if i + 1 < rows and not visited[k + cols]:
+            arr.append(DOWN)
+        if i - 1 >= 0 and not visited[k - cols]:
+            arr.append(UP)
+        if len(arr) == 0:
+            stack.pop()  #dead end, backtrack to the previous cell on the route
+            continue
+        temp = arr[rng.randint(0, len(arr) - 1)]
+        maze.join(k, temp)
+        k = k + maze.step[temp]
+        visited[k] = 1
+        if tree is not None:
+            tree[k] = temp
+        stack.append(k)
+        carved += 1
+        if carved == report:
+            progress(carved, rows * cols)
+            report += PROGRESS
+
+
+@register("kruskal")
+def kruskal(maze, rng, progress=None):
+    """
+    Randomized Kruskal: knock down walls in a shuffled order whenever they join two separate regions.
+    Regions are a disjoint-set forest with path halving and union by rank.
+    Time O(cells * a(cells)), effectively linear. Memory 4 bytes per cell for the forest,
+    one byte per cell for ranks and 4 or 8 bytes per wall for the shuffled wall list.
+    The fastest general generator here, lots of short dead ends.
+    """
+    rows, cols = maze.rows, maze.cols
+    size = rows * cols
+    if size < 2:
+        return
+    dtype = np.int32 if 2 * size < 2 ** 31 else np.int64
+    k = np.arange(size, dtype=dtype)
+    #wall id 2k is the right wall of cell k, 2k + 1 is its bottom wall
+    walls = np.concatenate((2 * k[k % cols != cols - 1], 2 * k[:size - cols] + 1))
+    del k
+    np.random.default_rng(rng.getrandbits(64)).shuffle(walls)
+
+    parent = array('i' if dtype == np.int32 else 'q', range(size))
+    rank = bytearray(size)
+    view = maze.view
+    rightwall, downwall = 1 << RIGHT, 1 << DOWN
+    leftwall, upwall = 1 << LEFT, 1 << UP
+    joined = 0
+    report = PROGRESS if progress is not None else -1
+    for w in memoryview(walls):
+        a = w >> 1
+        b = a + cols if w & 1 else a + 1
+        #disjoint-set find with path halving, inlined as this loop is the whole cost of the algorithm
+        ra = a
+        while parent[ra] != ra:
+            parent[ra] = parent[parent[ra]]
+            ra = parent[ra]
+        rb = b
+        while parent[rb] != rb:
+            parent[rb] = parent[parent[rb]]
+            rb = parent[rb]
+        if ra == rb:
+            continue
+        if rank[ra] < rank[rb]:
+            ra, rb = rb, ra
+        parent[rb] = ra
+        if rank[ra] == rank[rb]:
+            rank[ra] += 1
+        if w & 1:
+            view[a] &= ~downwall
+            view[b] &= ~upwall
+        else:
+            view[a] &= ~rightwall
+            view[b] &= ~leftwall
+        joined += 1
+        if joined == report:
+            progress(joined + 1, size)
+            report += PROGRESS
+        if joined == size - 1:
+            break
+
+
+@register("wilson")
+def wilson(maze, rng, progress=None):
+    """
+    Wilson's algorithm: loop-erased random walks from each cell not yet in the tree until they hit the tree.
+    Gives a uniform spanning tree, every possible maze is equally likely (no texture bias).
+    Expected time is the mean random walk hitting time, around O(cells log cells) on a grid, the
+    first few walks are the slow ones. Memory two bytes per cell (walk directions and tree flags).
+    """
+    rows, cols = maze.rows, maze.cols
+    size = rows * cols
+    intree = bytearray(size)
+    walk = bytearray(size)  #last direction taken out of each cell, overwriting it erases loops
+    intree[rng.randrange(size)] = 1
+    lastrow = size - cols
+    getrandbits = rng.getrandbits
+    step = maze.step
+    added = 1
+    report = PROGRESS if progress is not None else -1
+    for start in range(size):
+        if intree[start]:
+            continue
+        k = start
+        while not intree[k]:
+            d = getrandbits(2)
+            if d == UP:
+                if k < cols:
+                    continue
+            elif d == DOWN:
+                if k >= lastrow:
+                    continue
+            elif d == LEFT:
+                if k % cols == 0:
+                    continue
+            elif k % cols == cols - 1:
+                continue
+            walk[k] = d
+            k = k + step[d]
+        k = start
+        while not intree[k]:
+            intree[k] = 1
+            maze.join(k, walk[k])
+            k = k + step[walk[k]]
+            added += 1
+            if added == report:
+                progress(added, size)
+                report += PROGRESS
+
+
+@register("prim")
+def prim(maze, rng, progress=None):
+    """
+    Randomized Prim: grow the maze from one cell, each step attaching a random frontier cell
+    to a random neighbour already in the maze.
+    Time O(cells). Memory one byte per cell for the state plus a 4 byte per cell worst case frontier.
+    Many short branches radiating out from the start.
+    """
+    rows, cols = maze.rows, maze.cols
+    size = rows * cols
+    state = bytearray(size)  #0 outside, 1 frontier, 2 in the maze
+    frontier = array('i')
+    step = maze.step
+    tree = None if maze.tree is None else memoryview(maze.tree)
+
+    def add(k):
+        state[k] = 2
+        i, j = divmod(k, cols)
+        for d, ok in ((UP, i > 0), (DOWN, i < rows - 1), (LEFT, j > 0), (RIGHT, j < cols - 1)):
+            if ok and state[k + step[d]] == 0:
+                state[k + step[d]] = 1
+                frontier.append(k + step[d])
+
+    add(maze.index(*maze.start))
+    added = 1
+    report = PROGRESS if progress is not None else -1
+    while frontier:
+        #swap a random frontier cell to the end so removing it is O(1)
+        r = rng.randrange(len(frontier))
+        k = frontier[r]
+        frontier[r] = frontier[-1]
+        frontier.pop()
+        i, j = divmod(k, cols)
+        arr = [d for d, ok in ((UP, i > 0), (DOWN, i < rows - 1), (LEFT, j > 0), (RIGHT, j < cols - 1))
+               if ok and state[k + step[d]] == 2]
+        d = arr[rng.randrange(len(arr))]
+        maze.join(k, d)
+        if tree is not None:
+            tree[k] = OPPOSITE[d]
+        add(k)
+        added += 1
+        if added == report:
+            progress(added, size)
+            report += PROGRESS
+
+
+def ellerrows(rows, cols, rng):
+    """
+    Eller's algorithm as a generator, yields the maze one row at a time as a uint8 array of
+    wall bits (same encoding as Maze.cells). Only the current row's set labels are kept, so
+    memory is O(cols) however many rows are asked for and rows can go straight to disk or screen.
+    Time O(cells).
+    """
+    getrandbits = rng.getrandbits
+    sets = list(range(cols))  #set label of each cell in the current row, always < cols
+    up = bytearray(cols)  #1 where the cell above opened downwards into this row
+    rightwall, leftwall = 1 << RIGHT, 1 << LEFT
+    upwall, downwall = 1 << UP, 1 << DOWN
+    for i in range(rows):
+        last = i == rows - 1
+        row = bytearray([WALLS]) * cols
+        for j in range(cols):
+            if up[j]:
+                row[j] &= ~upwall
+        parent = list(range(cols))
+        for j in range(cols - 1):
+            a = sets[j]
+            while parent[a] != a:
+                parent[a] = parent[parent[a]]
+                a = parent[a]
+            b = sets[j + 1]
+            while parent[b] != b:
+                parent[b] = parent[parent[b]]
+                b = parent[b]
+            #the last row has to join everything that is still separate
+            if a != b and (last or getrandbits(1)):
+                parent[b] = a
+                row[j] &= ~rightwall
+                row[j + 1] &= ~leftwall
+        if last:
+            yield np.frombuffer(row, dtype=np.uint8)
+            return
+
+        groups = {}
+        for j in range(cols):
+            a = sets[j]
+            while parent[a] != a:
+                a = parent[a]
+            groups.setdefault(a, []).append(j)
+        up = bytearray(cols)
+        sets = [-1] * cols
+        label = 0
+        #every set needs at least one way down or it would be cut off from the rest
+        for members in groups.values():
+            forced = members[rng.randrange(len(members))]
+            for j in members:
+                if j == forced or getrandbits(1):
+                    up[j] = 1
+                    row[j] &= ~downwall
+                    sets[j] = label
+            label += 1
+        for j in range(cols):
+            if sets[j] < 0:
+                sets[j] = label
+                label += 1
+        yield np.frombuffer(row, dtype=np.uint8)
+
+
+@register("eller")
+def eller(maze, rng, progress=None):
+    """
+    Eller's algorithm filling a whole Maze, see ellerrows() for streaming without holding the maze.
+    Time O(cells), memory O(cols) on top of the maze itself.
+    """
+    report = PROGRESS
+    for i, row in enumerate(ellerrows(maze.rows, maze.cols, rng)):
+        maze.cells[i] = row
+        if progress is not None and (i + 1) * maze.cols >= report:
+            progress((i + 1) * maze.cols, maze.size)
+            report = (i + 1) * maze.cols + PROGRESS
+
+
+BLOCK = 1 << 22  #cells handled per numpy pass by the vectorized generators, caps their scratch memory
+
+
+def blocks(maze):
+    rows = max(1, BLOCK // maze.cols)
+    for r0 in range(0, maze.rows, rows):
+        yield r0, min(r0 + rows, maze.rows)
+
+
+@register("binarytree")
+def binarytree(maze, rng, progress=None):
+    """
+    Binary tree: every cell opens either up or right at random (top row only right, last column only up).
+    No python loop over cells, a fixed number of numpy operations per block of rows.
+    Time O(cells), scratch memory a few bytes per cell of one block. Strong diagonal bias,
+    the top row and right column are always straight corridors.
+    """
+    g = np.random.default_rng(rng.getrandbits(64))
+    cells = maze.cells
+    for r0, r1 in blocks(maze):
+        north = g.integers(0, 2, size=(r1 - r0, maze.cols), dtype=np.uint8).view(bool)
+        north[:, -1] = True
+        if r0 == 0:
+            north[0] = False
+        east = ~north
+        east[:, -1] = False
+        n8 = north.view(np.uint8)
+        e8 = east.view(np.uint8)
+        block = cells[r0:r1]
+        block &= ~(n8 << UP)
+        lo = max(r0, 1)
+        cells[lo - 1:r1 - 1] &= ~(n8[lo - r0:] << DOWN)
+        block &= ~(e8 << RIGHT)
+        block[:, 1:] &= ~(e8[:, :-1] << LEFT)
+        if progress is not None:
+            progress(r1 * maze.cols, maze.size)
+
+
+@register("sidewinder")
+def sidewinder(maze, rng, progress=None):
+    """
+    Sidewinder: each row is cut into random horizontal runs and every run opens up from one random
+    cell in it (the top row is a single run with no way up).
+    Runs never cross a row because the last column always ends one, so a whole block of rows is
+    done at once with a fixed number of numpy operations and no python loop over cells.
+    Time O(cells), scratch memory about 20 bytes per cell of one block. Vertical bias, the top row
+    is always one straight corridor.
+    """
+    g = np.random.default_rng(rng.getrandbits(64))
+    cols = maze.cols
+    cells = maze.cells
+    flat = cells.reshape(-1)
+    for r0, r1 in blocks(maze):
+        east = g.integers(0, 2, size=(r1 - r0, cols), dtype=np.uint8).view(bool)
+        if r0 == 0:
+            east[0] = True
+        east[:, -1] = False
+        e8 = east.view(np.uint8)
+        block = cells[r0:r1]
+        block &= ~(e8 << RIGHT)
+        block[:, 1:] &= ~(e8[:, :-1] << LEFT)
+
+        ends = np.flatnonzero(~east.reshape(-1))
+        starts = np.empty_like(ends)
+        starts[0] = 0
+        starts[1:] = ends[:-1] + 1
+        picks = starts + (g.random(len(ends)) * (ends - starts + 1)).astype(ends.dtype)
+        picks += r0 * cols
+        picks = picks[picks >= cols]  #nothing above the top row
+        flat[picks] &= WALLS ^ (1 << UP)
+        flat[picks - cols] &= WALLS ^ (1 << DOWN)
+        if progress is not None:
+            progress(r1 * cols, maze.size)
@@ -0,0 +1,60 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from mazecore import Maze
+from mazesolvers import solve
+
+#Solving many mazes at once. All the wall bytes are copied once into a single shared memory block,
+#workers map that block and build each Maze straight on top of it, so only a few numbers per maze
+#(offset, size, start, goal) go through pickling on the way in and only the routes come back.
+
+shared = None  #the worker's handle on the block, kept open for the life of the worker
+
+
+def attach(name):
+    global shared
+    try:
+        shared = shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        shared = shared_memory.SharedMemory(name=name)  #python < 3.13 has no track argument
+
+
+def solveshared(job):
+    offset, rows, cols, start, goal, method = job
+    cells = np.ndarray((rows, cols), dtype=np.uint8, buffer=shared.buf, offset=offset)
+    maze = Maze(rows, cols, cells)
+    maze.start = start
+    maze.goal = goal
+    path = solve(maze, method).path
+    del maze, cells  #drop the views into the block before the next job
+    return path
+
+
+def solvebatch(mazes, method="bfs", workers=None):
+    """
+    Solves every maze in mazes with the named solver across a process pool.
+    Returns (lengths, paths): an int64 array with the number of cells on each route
+    (0 where there is none) and a list with each route as an int64 array of flat indices.
+    """
+    mazes = list(mazes)
+    if not mazes:
+        return np.zeros(0, dtype=np.int64), []
+    total = sum(maze.size for maze in mazes)
+    block = shared_memory.SharedMemory(create=True, size=max(total, 1))
+    try:
+        jobs = []
+        offset = 0
+        for maze in mazes:
+            np.ndarray(maze.size, dtype=np.uint8, buffer=block.buf, offset=offset)[:] = maze.cells.reshape(-1)
+            jobs.append((offset, maze.rows, maze.cols, maze.start, maze.goal, method))
+            offset += maze.size
+        workers = workers or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=workers, initializer=attach, initargs=(block.name,)) as pool:
+            paths = list(pool.map(solveshared, jobs, chunksize=max(1, len(jobs) // (workers * 4))))
+    finally:
+        block.close()
+        block.unlink()
+    return np.array([len(path) for path in paths], dtype=np.int64), paths
@@ -0,0 +1,94 @@
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+from mazegenerator_2_copy import mazegenerate
+from mazesolvers import solve
+
+#Benchmarks generation, solving and rendering separately for every algorithm and size.
+#Each stage is run once untimed to warm up, then once for wall time and once more under tracemalloc
+#for peak memory, tracemalloc slows python code down a lot so the two are never measured together.
+#
+#   python mazebench.py --sizes 50 500 5000 --output bench.json
+#   python mazebench.py --baseline bench.json --threshold 0.2   (exit code 1 on slowdowns)
+
+
+def measure(func):
+    start = time.perf_counter()
+    result = func()
+    seconds = time.perf_counter() - start
+    del result
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return seconds, peak
+
+
+def run(sizes, algorithms, solvers=("dfs",), repeat=1, seed=0):
+    results = []
+    for algorithm in algorithms:
+        for n in sizes:
+            maze = mazegenerate(n, algorithm, seed=seed, tree="tree" in solvers)
+            stages = [("generate", lambda: mazegenerate(n, algorithm, seed=seed))]
+            for method in solvers:
+                stages.append(("solve:" + method, lambda method=method: solve(maze, method)))
+            stages.append(("render", maze.image))
+            for stage, func in stages:
+                func()  #one-time costs (lazy imports, first allocations) would land on whichever algorithm ran first
+                seconds, peak = min(measure(func) for _ in range(repeat))
+                results.append({"algorithm": algorithm, "n": n, "stage": stage, "seconds": seconds,
+                                "peak_bytes": peak, "cells_per_sec": n * n / seconds if seconds else 0.0})
+                if stage.startswith("solve:"):
+                    results[-1]["expanded"] = func().expanded
+                print("%-10s %6d %-20s %9.4fs %10.1f MB %14.0f cells/s" % (
+                    algorithm, n, stage, seconds, peak / 1e6, results[-1]["cells_per_sec"]))
+    return results
+
+
+def compare(results, baseline, threshold):
+    #returns the results that got slower than baseline by more than threshold (0.2 = 20%)
+    old = {(r["algorithm"], r["n"], r["stage"]): r["seconds"] for r in baseline["results"]}
+    slower = []
+    for r in results:
+        before = old.get((r["algorithm"], r["n"], r["stage"]))
+        if before and r["seconds"] > before * (1 + threshold):
+            slower.append((r, before))
+    return slower
+
+
+def main(argv=None):
+    from mazealgorithms import GENERATORS
+    from mazesolvers import SOLVERS
+    parser = argparse.ArgumentParser(description="Benchmark maze generation, solving and rendering")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 200, 1000])
+    parser.add_argument("--algorithms", nargs="+", default=sorted(GENERATORS), choices=sorted(GENERATORS))
+    parser.add_argument("--solvers", nargs="+", default=sorted(SOLVERS), choices=sorted(SOLVERS))
+    parser.add_argument("--repeat", type=int, default=1, help="best of this many runs per measurement")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="JSON file from an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown before flagging")
+    args = parser.parse_args(argv)
+
+    results = run(args.sizes, args.algorithms, args.solvers, args.repeat, args.seed)
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump({"python": sys.version, "machine": platform.platform(), "results": results}, file, indent=1)
+    if args.baseline:
+        with open(args.baseline) as file:
+            slower = compare(results, json.load(file), args.threshold)
+        for r, before in slower:
+            print("SLOWER %s n=%d %s: %.4fs -> %.4fs (%+.0f%%)" % (
+                r["algorithm"], r["n"], r["stage"], before, r["seconds"], (r["seconds"] / before - 1) * 100))
+        if slower:
+            return 1
+        print("no slowdowns beyond %.0f%%" % (args.threshold * 100))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+import hashlib
+import os
+
+import numpy as np
+
+from mazecore import Maze
+
+#Seeded mazes are fully determined by (rows, cols, algorithm, seed, tile), so they are stored on disk
+#under a hash of those values, with the spanning tree (Maze.tree) next to them when there is one.
+#Hits are memory mapped copy-on-write, so opening one costs a few page faults instead of a full read
+#and the Maze can still be changed without touching the file.
+#The directory is kept under a byte budget by deleting the least recently used files, a hit
+#bumps the file's modification time.
+
+VERSION = 1  #part of every key, bump it when a generator changes what it makes for a seed
+
+
+class MazeCache:
+
+    def __init__(self, directory, budget=256 * 1024 * 1024):
+        self.directory = directory
+        self.budget = budget
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key(rows, cols, algorithm, seed, tile=None):
+        #repr keeps seeds of different types apart (1, "1" and b"1" are all valid random.Random seeds)
+        text = "%d,%d,%d,%s,%r,%s" % (VERSION, rows, cols, algorithm, seed, tile or 0)
+        return hashlib.sha256(text.encode()).hexdigest()
+
+    def path(self, key, part=""):
+        return os.path.join(self.directory, key + part + ".npy")
+
+    def load(self, path):
+        try:
+            array = np.load(path, mmap_mode='c')
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        return array
+
+    def get(self, key):
+        #the maze, with its tree if one was stored, or None
+        cells = self.load(self.path(key))
+        if cells is None:
+            return None
+        maze = Maze(cells.shape[0], cells.shape[1], cells)
+        tree = self.load(self.path(key, ".tree"))
+        if tree is not None and tree.shape == (maze.size,):
+            maze.tree = tree
+        return maze
+
+    def save(self, path, array):
+        temp = path + ".tmp"
+        with open(temp, 'wb') as file:
+            np.save(file, np.ascontiguousarray(array))
+        os.replace(temp, path)  #never leave a half written file under a real key
+
+    def put(self, key, maze):
+        #the tree goes first, a maze file that is there always has whatever tree it was stored with
+        if maze.tree is not None:
+            self.save(self.path(key, ".tree"), maze.tree)
+        self.save(self.path(key), maze.cells)
+        self.evict()
+
+    def puttree(self, key, tree):
+        #adds a tree to a maze that was stored without one
+        self.save(self.path(key, ".tree"), tree)
+        self.evict()
+
+    def evict(self):
+        files = []
+        total = 0
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".npy"):
+                stat = entry.stat()
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+        files.sort()
+        for mtime, size, path in files:
+            if total <= self.budget:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue  #still mapped somewhere (windows), try the next one
+            total -= size
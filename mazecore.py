@@ -0,0 +1,111 @@
+import numpy as np
+
+#direction codes, same as the old nested-list maze
+UP = 0
+DOWN = 1
+LEFT = 2
+RIGHT = 3
+
+DI = (-1, 1, 0, 0)  #change in i for each direction
+DJ = (0, 0, -1, 1)  #change in j for each direction
+OPPOSITE = (DOWN, UP, RIGHT, LEFT)
+WALLS = 15  #all four wall bits set, bit d is the wall in direction d
+UNSEEN = 255  #"came from" value for a cell not reached yet
+ORIGIN = 4  #"came from" value for the cell everything was reached from, not a direction
+
+
+class Maze:
+    """
+    A rows x cols maze stored as one contiguous uint8 array.
+    Each cell holds four wall bits (1 << direction), a cleared bit is a passage.
+    Passages are always cleared on both sides so each cell can be read on its own.
+    """
+
+    def __init__(self, rows, cols=None, cells=None):
+        if cols is None:
+            cols = rows
+        if cells is None:
+            cells = np.full((rows, cols), WALLS, dtype=np.uint8)
+        self.rows = rows
+        self.cols = cols
+        self.cells = cells.reshape(rows, cols)
+        #flat byte view, indexing it from python loops is a lot cheaper than indexing the numpy array
+        self.view = memoryview(self.cells.reshape(-1))
+        self.step = (-cols, cols, -1, 1)  #change in flat index for each direction
+        self.start = (0, 0)
+        self.goal = (rows - 1, cols - 1)
+        self.algorithm = None  #how the maze was made, filled in by mazegenerate
+        self.seed = None
+        #optional spanning tree rooted at start, one byte per cell: the direction each cell was entered
+        #from on its way out of the start (ORIGIN at the start), so walking it backwards reaches the start
+        self.tree = None
+
+    def __getstate__(self):
+        #pickling (sending a maze to a worker process) leaves out the byte view, it is made again from cells
+        state = self.__dict__.copy()
+        del state["view"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.view = memoryview(self.cells.reshape(-1))
+
+    def __len__(self):
+        return self.rows
+
+    @property
+    def size(self):
+        return self.rows * self.cols
+
+    @property
+    def nbytes(self):
+        return self.cells.nbytes
+
+    def index(self, i, j):
+        return i * self.cols + j
+
+    def coords(self, k):
+        return divmod(k, self.cols)
+
+    def isopen(self, i, j, d):
+        return not (self.view[i * self.cols + j] >> d) & 1
+
+    def carve(self, i, j, d):
+        #removes the wall between (i, j) and its neighbour in direction d
+        self.join(i * self.cols + j, d)
+
+    def join(self, k, d):
+        #same as carve but takes the flat index of the cell
+        self.view[k] &= WALLS ^ (1 << d)
+        self.view[k + self.step[d]] &= WALLS ^ (1 << OPPOSITE[d])
+
+    def exits(self, i, j):
+        #directions that can be walked from (i, j)
+        w = self.view[i * self.cols + j]
+        return [d for d in range(4) if not (w >> d) & 1]
+
+    def neighbours(self, i, j):
+        return [(i + DI[d], j + DJ[d]) for d in self.exits(i, j)]
+
+    def degree(self):
+        #number of open sides for every cell, as a rows x cols array
+        open_ = ~self.cells & WALLS
+        return ((open_ & 1) + (open_ >> 1 & 1) + (open_ >> 2 & 1) + (open_ >> 3 & 1)).astype(np.uint8)
+
+    def band(self, r0, r1):
+        #rows r0 up to r1 of the wall bits, the same call works on an opened maze file (mazefile.py)
+        return self.cells[r0:r1]
+
+    def copy(self):
+        maze = Maze(self.rows, self.cols, self.cells.copy())
+        maze.start = self.start
+        maze.goal = self.goal
+        maze.algorithm = self.algorithm
+        maze.seed = self.seed
+        maze.tree = None if self.tree is None else self.tree.copy()
+        return maze
+
+    def image(self):
+        #the image is only built when something asks for it
+        from mazerender import render
+        return render(self)
@@ -0,0 +1,189 @@
+import os
+import shutil
+import tempfile
+import time
+from array import array
+from collections import OrderedDict
+
+import numpy as np
+
+from mazepath import MazePath, encode
+from mazesolvers import Solution
+
+#Solving mazes that do not fit in memory, normally an opened maze file (mazefile.openmaze) but a Maze works too.
+#The grid is cut into bands of whole rows, so every band is one contiguous stretch of the payload and of
+#the scratch files. Only one band is unpacked at a time. All search state lives in memmapped scratch files:
+#   visited: 1 bit per cell
+#   came: the direction each cell was entered from, 2 bits per cell
+#   frontier: cells that were reached across a band edge but not yet entered, as int64 (cell * 4 + direction)
+#A band is flooded completely from its pending cells before moving on. Crossings in the sweep direction
+#are carried into the next band, the rest are spilled to the frontier file for the next sweep, and the
+#sweeps go down and up in turn until the goal has been entered or the frontier is empty.
+#A flood finds the route in a perfect maze, in a maze with loops it finds a route but not always the shortest.
+
+TILE = 1 << 22  #cells per band, rounded to whole rows
+KEEP = 4  #bands kept unpacked, a winding route crosses back and forth over the same band edges
+
+
+class Frontier:
+    #an append-only int64 file, read back sorted through a memmap
+    def __init__(self, filename):
+        self.filename = filename
+        self.count = 0
+        open(filename, "wb").close()
+
+    def extend(self, entries):
+        entries = np.asarray(entries, dtype=np.int64)
+        if len(entries):
+            with open(self.filename, "ab") as file:
+                file.write(entries.tobytes())
+            self.count += len(entries)
+
+    def sorted(self):
+        if self.count == 0:
+            return np.zeros(0, dtype=np.int64)
+        return np.sort(np.memmap(self.filename, dtype=np.int64, mode="r", shape=(self.count,)))
+
+
+class Bands:
+    #the unpacked bands, least recently used first. Wall bits come from the maze, visited and came from the
+    #scratch bitmaps, and are packed back into the bitmaps when the band is dropped
+    def __init__(self, maze, bandrows, visited, came, keep):
+        self.maze = maze
+        self.bandrows = bandrows
+        self.visited = visited
+        self.came = came
+        self.keep = keep
+        self.open = OrderedDict()
+
+    def get(self, b):
+        if b in self.open:
+            self.open.move_to_end(b)
+            return self.open[b]
+        if len(self.open) >= self.keep:
+            self.store(*self.open.popitem(last=False))
+        r0, r1 = b * self.bandrows, min((b + 1) * self.bandrows, self.maze.rows)
+        base, count = r0 * self.maze.cols, (r1 - r0) * self.maze.cols
+        walls = memoryview(np.ascontiguousarray(self.maze.band(r0, r1)).reshape(-1))
+        seen = np.unpackbits(self.visited[base // 8:(base + count + 7) // 8], bitorder="little")
+        pairs = self.came[base // 4:(base + count + 3) // 4]
+        came = np.empty(len(pairs) * 4, dtype=np.uint8)
+        for s in range(4):
+            came[s::4] = pairs >> (2 * s) & 3
+        self.open[b] = (base, count, walls, seen, came)
+        return self.open[b]
+
+    def store(self, b, band):
+        base, count, walls, seen, came = band
+        self.visited[base // 8:(base + count + 7) // 8] = np.packbits(seen, bitorder="little")
+        self.came[base // 4:(base + count + 3) // 4] = came[0::4] | came[1::4] << 2 | came[2::4] << 4 | came[3::4] << 6
+
+    def flush(self):
+        while self.open:
+            self.store(*self.open.popitem(last=False))
+
+
+def scratch(directory, name, nbytes):
+    return np.memmap(os.path.join(directory, name), dtype=np.uint8, mode="w+", shape=(max(nbytes, 1),))
+
+
+def flood(walls, seen, came, step, size, pending, base, spill):
+    #fills everything reachable inside one band from the pending (cell * 4 + direction) entries
+    #cells outside the band go to spill. Returns how many cells were entered
+    entered = 0
+    stack = array('q')
+    for entry in pending:
+        k = (entry >> 2) - base
+        if not seen[k]:
+            seen[k] = 1
+            came[k] = entry & 3
+            stack.append(k)
+            entered += 1
+    while stack:
+        k = stack.pop()
+        w = walls[k]
+        for d in range(4):
+            if not (w >> d) & 1:
+                n = k + step[d]
+                if n < 0 or n >= size:
+                    spill.append((base + n) * 4 + d)
+                elif not seen[n]:
+                    seen[n] = 1
+                    came[n] = d
+                    stack.append(n)
+                    entered += 1
+    return entered
+
+
+def solveexternal(maze, directory=None, tile=TILE, keep=KEEP, progress=None):
+    """
+    Floods maze band by band with all search state in scratch files under directory (default: the temp dir),
+    which are removed afterwards. tile is the number of cells per band and keep how many bands stay unpacked
+    at once, so memory use is about 3 * tile * keep bytes whatever the size of the maze.
+    progress, if given, is called after every band as progress(entered, total, eta): cells entered so far,
+    cells in the maze and an estimate of the seconds left (None until something has been entered).
+    The estimate assumes the whole maze is flooded, so it is an upper bound when the goal is found early.
+    Returns a Solution(path, entered). path is a MazePath, or None if the goal cannot be reached
+    (like something_copy.solvepath), entered is the number of cells the flood entered.
+    """
+    rows, cols, size = maze.rows, maze.cols, maze.size
+    bandrows = max(8, tile // cols // 8 * 8)  #a multiple of 8 rows keeps every band on whole bytes of both bitmaps
+    nbands = (rows + bandrows - 1) // bandrows
+    bandcells = bandrows * cols
+    start, goal = maze.index(*maze.start), maze.index(*maze.goal)
+    goalband = goal // bandcells
+    work = tempfile.mkdtemp(prefix="mazeexternal", dir=directory)
+    try:
+        visited = scratch(work, "visited", (size + 7) // 8)
+        cameto = scratch(work, "came", (size + 3) // 4)
+        bands = Bands(maze, bandrows, visited, cameto, keep)
+        frontier = Frontier(os.path.join(work, "frontier0"))
+        frontier.extend(array('q', [start * 4]))
+        entered = 0
+        began = time.perf_counter()
+        sweep = 0
+        done = False
+        while frontier.count and not done:
+            pending = frontier.sorted()
+            frontier = Frontier(os.path.join(work, "frontier" + str(sweep % 2 ^ 1)))
+            edges = np.searchsorted(pending, np.arange(nbands + 1, dtype=np.int64) * bandcells * 4)
+            order = range(nbands) if sweep % 2 == 0 else range(nbands - 1, -1, -1)
+            carry = array('q')
+            for b in order:
+                if edges[b] == edges[b + 1] and not carry:
+                    continue
+                base, count, walls, seen, came = bands.get(b)
+                spill = array('q')
+                entries = np.concatenate((pending[edges[b]:edges[b + 1]], np.frombuffer(carry, dtype=np.int64)))
+                entered += flood(walls, memoryview(seen), memoryview(came), maze.step, count, entries.tolist(), base, spill)
+
+                #crossings into the next band of this sweep are flooded now, the others wait for the next sweep
+                spill = np.frombuffer(spill, dtype=np.int64)
+                ahead = spill >= (base + count) * 4 if sweep % 2 == 0 else spill < base * 4
+                carry = array('q', spill[ahead].tobytes())
+                frontier.extend(spill[~ahead])
+                if progress is not None:
+                    elapsed = time.perf_counter() - began
+                    progress(entered, size, elapsed * (size - entered) / entered if entered else None)
+                if b == goalband and seen[goal - base]:
+                    done = True
+                    break
+            frontier.extend(carry)  #crossings off the last band of the sweep
+            sweep += 1
+
+        bands.flush()
+        if not done:
+            return Solution(None, entered)
+        #walk the 2 bit directions back from the goal to the start, then run-length encode them
+        packed = memoryview(cameto)
+        step = maze.step
+        moves = bytearray()
+        k = goal
+        while k != start:
+            d = packed[k >> 2] >> (2 * (k & 3)) & 3
+            moves.append(d)
+            k -= step[d]
+        del packed
+        return Solution(MazePath(maze, start, encode(np.frombuffer(moves, dtype=np.uint8)[::-1])), entered)
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
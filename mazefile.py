@@ -0,0 +1,137 @@
+import struct
+
+import numpy as np
+
+from mazecore import Maze
+
+#Binary maze files, version 1, all little endian:
+#   128 byte header: b"MAZE", version (u16), flags (u16, bit 0 = has seed), rows (u64), cols (u64),
+#   seed (i64), algorithm (16 bytes ascii, zero padded), start i, start j, goal i, goal j (u64 each),
+#   zero padding up to 128 bytes
+#   Only int seeds are stored. A maze seeded with anything else (a str or bytes seed) is written without
+#   the has seed flag and loads with seed None, an int seed outside 64 bits raises ValueError.
+#   payload: the four wall bits of every cell in row major order, two cells per byte,
+#   the even cell in the low nibble. An odd cell count leaves the last high nibble zero.
+#openmaze() memory maps the payload, so opening is instant whatever the size and only the pages
+#that are read get loaded. loadmaze() unpacks everything into an ordinary Maze.
+
+MAGIC = b"MAZE"
+VERSION = 1
+HEADER = struct.Struct("<4sHHQQq16sQQQQ")
+HEADERSIZE = 128
+HASSEED = 1
+BLOCK = 1 << 24  #cells packed or unpacked per numpy pass, even so blocks never split a byte
+
+
+def savemaze(filename, maze):
+    flags = 0
+    seed = 0
+    if isinstance(maze.seed, int):
+        if not -2 ** 63 <= maze.seed < 2 ** 63:
+            raise ValueError("The seed does not fit in 64 bits")
+        flags |= HASSEED
+        seed = maze.seed
+    algorithm = (maze.algorithm or "").encode("ascii")[:16]
+    header = HEADER.pack(MAGIC, VERSION, flags, maze.rows, maze.cols, seed, algorithm,
+                         maze.start[0], maze.start[1], maze.goal[0], maze.goal[1])
+    flat = maze.cells.reshape(-1)
+    with open(filename, "wb") as file:
+        file.write(header.ljust(HEADERSIZE, b"\x00"))
+        for k in range(0, maze.size, BLOCK):
+            block = flat[k:k + BLOCK]
+            if len(block) % 2:
+                block = np.append(block, np.uint8(0))
+            file.write((block[0::2] | (block[1::2] << 4)).tobytes())
+
+
+class NibbleView:
+    #reads one cell's wall bits at a time from the packed payload, like Maze.view
+    def __init__(self, packed, size):
+        self.data = memoryview(packed)
+        self.size = size
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, k):
+        b = self.data[k >> 1]
+        return b >> 4 if k & 1 else b & 15
+
+
+class MazeFile:
+    """
+    An opened maze file. The payload stays on disk as a read only memmap and is unpacked on demand,
+    a band of rows at a time with band() or per cell through view. It has the same rows, cols, size,
+    step, start, goal, index() and view as a Maze, which is enough for the bfs, dfs, astar and bidirectional
+    solvers, mazeexternal.solveexternal and mazerender.streampng (through iterrows()). It has no cells array,
+    so anything that works on the whole grid at once (the deadend solver, degree(), render/writepng,
+    JunctionGraph) needs loadmaze() or tomaze() instead.
+    """
+
+    def __init__(self, filename):
+        with open(filename, "rb") as file:
+            raw = file.read(HEADER.size)
+        if len(raw) < HEADER.size or raw[:4] != MAGIC:
+            raise ValueError(filename + " is not a maze file")
+        magic, version, flags, rows, cols, seed, algorithm, si, sj, gi, gj = HEADER.unpack(raw)
+        if version != VERSION:
+            raise ValueError(filename + " is maze file version " + str(version) + ", only version 1 can be read")
+        self.filename = filename
+        self.rows = rows
+        self.cols = cols
+        self.seed = seed if flags & HASSEED else None
+        self.algorithm = algorithm.rstrip(b"\x00").decode("ascii") or None
+        self.start = (si, sj)
+        self.goal = (gi, gj)
+        self.step = (-cols, cols, -1, 1)
+        self.tree = None
+        self.packed = np.memmap(filename, dtype=np.uint8, mode="r", offset=HEADERSIZE, shape=((rows * cols + 1) // 2,))
+        self.view = NibbleView(self.packed, rows * cols)
+
+    def __len__(self):
+        return self.rows
+
+    @property
+    def size(self):
+        return self.rows * self.cols
+
+    def index(self, i, j):
+        return i * self.cols + j
+
+    def unpack(self, k0, k1):
+        #wall bits of flat cells k0 up to k1 as a uint8 array
+        packed = np.asarray(self.packed[k0 >> 1:(k1 + 1) >> 1])
+        cells = np.empty(len(packed) * 2, dtype=np.uint8)
+        cells[0::2] = packed & 15
+        cells[1::2] = packed >> 4
+        first = k0 & 1
+        return cells[first:first + k1 - k0]
+
+    def band(self, r0, r1):
+        #rows r0 up to r1 as an (r1 - r0) x cols uint8 array, only those pages are read
+        return self.unpack(r0 * self.cols, r1 * self.cols).reshape(r1 - r0, self.cols)
+
+    def iterrows(self, rows=None):
+        #one row at a time, for streampng and friends, unpacking a block of rows per read
+        rows = rows or max(1, BLOCK // self.cols)
+        for r0 in range(0, self.rows, rows):
+            yield from self.band(r0, min(r0 + rows, self.rows))
+
+    def tomaze(self):
+        maze = Maze(self.rows, self.cols)
+        flat = maze.cells.reshape(-1)
+        for k in range(0, self.size, BLOCK):
+            flat[k:k + BLOCK] = self.unpack(k, min(k + BLOCK, self.size))
+        maze.start = self.start
+        maze.goal = self.goal
+        maze.algorithm = self.algorithm
+        maze.seed = self.seed
+        return maze
+
+
+def openmaze(filename):
+    return MazeFile(filename)
+
+
+def loadmaze(filename):
+    return MazeFile(filename).tomaze()
@@ -1,136 +1,50 @@
 import random
-#import numpy as np
-from PIL import Image
 
-#makesure maze fits on screen
-
-#n = 1000
-#What is special about -2? indicates that cell has been visited
-
-#maze = np.empty((n, n), dtype=object)
-#for t in range(n):
- #   for x in range(n):
-  #      maze[t][x] = [-1]
-
-
-def mazegenerate(n):
-    maze = [[[-1] for _ in range(n)] for _ in range(n)]
-
-
-    i = 0  # x
-    j = 0  # y
-
-    # up = 0
-    # down = 1
-    # left = 2
-    # right = 3
-    arr = []
-    count = 0
-    temp = 0
-    while count < (n * n):
-        if count == (n * n) - 1:
-            maze[i][j][0] = -2
-            #print(i,j)
-            break
-        while True:
-            #printmazey(i, j)
-            arr = []  # resets arr to an empty array
-            if j - 1 >= 0:
-                if maze[i][j - 1][0] == -1:
-                    arr.append(2)
-            #print(i,j)
-            if j + 1 < n:
-                if maze[i][j + 1][0] == -1:
-                    arr.append(3)
-            #print(i,j)
-            if i + 1 < n:
-                if maze[i + 1][j][0] == -1:
-                    arr.append(1)
-            #print(i,j)
-            if i - 1 >= 0:
-                if maze[i - 1][j][0] == -1:
-                    arr.append(0)
-            #print(arr, " This is arr")
-            #print()
-            if len(arr) == 0:
-                if maze[i][j][0] == -1:
-                    maze[i][j][0] = -2
-                try:
-                    if j - 1 >= 0:
-                        for g in range(0, len(maze[i][j - 1])):
-                            #print(g, "j-1")
-                            if maze[i][j - 1][g] == 3:
-                                j = j - 1
-                                raise Exception("")
-                    if j + 1 < len(maze[i]):
-                        for g in range(0, len(maze[i][j + 1])):
-                            #print(g, "j+1")
-                            if maze[i][j + 1][g] == 2:
-                                j = j + 1
-                                raise Exception("")
-                    if i + 1 < len(maze):
-                        for g in range(0, len(maze[i + 1][j])):
-                            #print(g, "i+1")
-                            if maze[i + 1][j][g] == 0:
-                                i = i + 1
-                                raise Exception("")
-                    if i - 1 >= 0:
-                        for g in range(0, len(maze[i - 1][j])):
-                            #print(g, "i-1")
-                            if maze[i - 1][j][g] == 1:
-                                i = i - 1
-                                raise Exception("")
-                except Exception:
-                    pass
+import numpy as np
 
+from mazecore import Maze, UNSEEN, ORIGIN
+from mazealgorithms import getgenerator, TREEGENERATORS
+from mazesolvers import spanningtree
+from mazetiled import tiledgenerate
 
+#makesure maze fits on screen
 
-            else:
-                break
-
-        temp = arr[random.randint(0, len(arr) - 1)]
-        if maze[i][j][0] == -1:
-            maze[i][j][0] = temp
-        else:
-            maze[i][j].append(temp)
-
-        if temp == 0:
-            i = i - 1
-        elif temp == 1:
-            i = i + 1
-        elif temp == 3:
-            j = j + 1
-        else:
-            j = j - 1
-        count = count + 1
-
-    #printmazey(-1,-1)
-    #printmaze()
-    n = n * 2
-    image = Image.new('RGB', (n + 1, n + 1), color=(0, 0, 0))
-
-    i = 0
-    j = 0
-
-    #in image.putpixel(), the j coordinate comes first. j,i. can use kinda the same i and j as for the array, its quite similar
-    for ci in range(1, n, 2):
-        j = 0
-        for cj in range(1, n, 2):
-            image.putpixel((cj, ci), (255, 255, 255))
-            for g in range(len(maze[i][j])):
-                if maze[i][j][g] == 0:
-                    image.putpixel((cj, ci - 1), (255, 255, 255))  #for all, values of i and j are incremented
-                elif maze[i][j][g] == 1:
-                    image.putpixel((cj, ci + 1), (255, 255, 255))
-                elif maze[i][j][g] == 2:
-                    image.putpixel((cj - 1, ci), (255, 255, 255))
-                elif maze[i][j][g] == 3:
-                    image.putpixel((cj + 1, ci), (255, 255, 255))
-            j = j + 1
-        i = i + 1
-
-    image.putpixel((n - 1, n - 1), (0, 255, 0))
-    image.putpixel((1, 1), (255, 0, 0))
-    #image = image.resize((2048, 2048), Image.NONE)
-    #image.resize((2048, 2048), Image.NONE).save("E:\output3.png")
-    return [image, maze]
+#The maze used to be a list of lists of lists of direction codes (-2 meant a visited dead end).
+#It is now a Maze: one uint8 per cell holding the four wall bits, see mazecore.py
+#The algorithms live in mazealgorithms.py, pick one by name:
+#"dfs" (the original), "kruskal", "wilson" (unbiased), "prim", "eller",
+#or "binarytree" and "sidewinder" which are pure numpy and by far the fastest but have a visible bias
+#For mazes too tall to hold in memory use mazealgorithms.ellerrows, it yields one row at a time
+#Giving a tile size builds the maze in tile x tile pieces across worker processes, see mazetiled.py
+
+
+#A seed makes the maze repeatable, with a cache (mazecache.MazeCache) seeded mazes are only built once
+#tree=True also gives the maze its spanning tree (Maze.tree) so routes to the start need no search.
+#dfs and prim record it while carving, for anything else it takes one extra pass over the maze
+#A cached maze keeps its tree in the cache as well, so a hit never has to build it again
+#progress(done, total) is handed to the generator, see mazealgorithms.py. Tiled mazes do not report.
+
+
+def mazegenerate(n, algorithm="dfs", seed=None, tile=None, workers=None, cache=None, tree=False, progress=None):
+    if seed is not None and cache is not None:
+        key = cache.key(n, n, algorithm, seed, tile)
+        maze = cache.get(key)
+        if maze is None:
+            maze = mazegenerate(n, algorithm, seed, tile, workers, tree=tree, progress=progress)
+            cache.put(key, maze)
+        elif tree and maze.tree is None:
+            maze.tree = spanningtree(maze)
+            cache.puttree(key, maze.tree)
+    elif tile:
+        maze = tiledgenerate(n, n, algorithm, tile, seed, workers)
+    else:
+        maze = Maze(n)
+        if tree and algorithm in TREEGENERATORS:
+            maze.tree = np.full(maze.size, UNSEEN, dtype=np.uint8)
+            maze.tree[maze.index(*maze.start)] = ORIGIN
+        getgenerator(algorithm)(maze, random if seed is None else random.Random(seed), progress)
+    if tree and maze.tree is None:
+        maze.tree = spanningtree(maze)
+    maze.algorithm = algorithm
+    maze.seed = seed
+    return maze
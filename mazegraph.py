@@ -0,0 +1,261 @@
+import heapq
+from array import array
+
+import numpy as np
+
+from mazecore import OPPOSITE
+
+#Most cells of a big maze are corridor cells with exactly two open sides. JunctionGraph keeps only the
+#other cells (junctions, dead ends, plus the start and goal) as nodes and turns every corridor into
+#one weighted edge, so route searches touch nodes instead of cells. Dead-end branches are then
+#stripped off to leave a small core, see __init__. Routes come back as segments
+#(cell, first direction, length) and are only expanded into cells when iterated.
+
+#OTHER[w][d] is the way on out of a two-sided cell with open-side bits w that was entered going d
+OTHER = [[-1] * 4 for _ in range(16)]
+for _w in range(16):
+    for _d in range(4):
+        _exits = [e for e in range(4) if (_w >> e) & 1 and e != OPPOSITE[_d]]
+        if len(_exits) == 1:
+            OTHER[_w][_d] = _exits[0]
+
+
+class JunctionGraph:
+
+    def __init__(self, maze):
+        self.maze = maze
+        size = maze.size
+        keep = maze.degree().reshape(-1) != 2
+        keep[maze.index(*maze.start)] = True
+        keep[maze.index(*maze.goal)] = True
+        self.isnode = memoryview(keep.view(np.uint8))
+        self.nodes = np.flatnonzero(keep)  #cell index of every node, sorted so node ids come from searchsorted
+        self.sides = memoryview(~maze.cells.reshape(-1) & 15)  #open-side bits, the walls flipped
+
+        #every corridor is walked once, from whichever end is reached first, and stored both ways round
+        done = bytearray(size)  #bit d set once the corridor leaving this node in direction d is stored
+        src, dst, lengths = array('q'), array('q'), array('q')
+        dirs = bytearray()
+        for k in self.nodes.tolist():
+            w = self.sides[k]
+            for d in range(4):
+                if not (w >> d) & 1 or (done[k] >> d) & 1:
+                    continue
+                end, n, last, hit = self.walk(k, d)
+                back = OPPOSITE[last]
+                done[k] |= 1 << d
+                done[end] |= 1 << back
+                src.append(k)
+                dst.append(end)
+                lengths.append(n)
+                dirs.append(d)
+                src.append(end)
+                dst.append(k)
+                lengths.append(n)
+                dirs.append(back)
+        del done
+
+        #compressed sparse rows: the edges of node u are offsets[u]:offsets[u + 1]
+        count = len(self.nodes)
+        src = np.searchsorted(self.nodes, np.frombuffer(src, dtype=np.int64))
+        order = np.argsort(src, kind="stable")
+        self.offsets = np.zeros(count + 1, dtype=np.int64)
+        np.cumsum(np.bincount(src, minlength=count), out=self.offsets[1:])
+        self.targets = np.searchsorted(self.nodes, np.frombuffer(dst, dtype=np.int64))[order]
+        self.lengths = np.frombuffer(lengths, dtype=np.int64)[order]
+        self.dirs = np.frombuffer(bytes(dirs), dtype=np.uint8)[order]
+        position = np.empty_like(order)
+        position[order] = np.arange(len(order))
+        self.twin = position[order ^ 1]  #the same corridor walked the other way, edges were stored in pairs
+
+        #strip dead-end branches off repeatedly, like dead-end filling but on the nodes. A stripped node keeps
+        #the edge it hung from, so the stripped parts are trees hanging off the core and a route only needs
+        #a search on the core. In a perfect maze everything but one node goes and routes are pure climbing.
+        self.exitedge = np.full(count, -1, dtype=np.int64)
+        exitedge = memoryview(self.exitedge)
+        offsets, targets = memoryview(self.offsets), memoryview(self.targets)
+        degree = np.diff(self.offsets)
+        left = memoryview(degree)
+        stripped = bytearray(count)
+        leaves = np.flatnonzero(degree == 1).tolist()
+        while leaves:
+            u = leaves.pop()
+            if left[u] != 1:
+                continue
+            for e in range(offsets[u], offsets[u + 1]):
+                v = targets[e]
+                if not stripped[v] and v != u:
+                    break
+            stripped[u] = 1
+            left[u] = 0
+            exitedge[u] = e
+            left[v] -= 1
+            if left[v] == 1:
+                leaves.append(v)
+
+    @property
+    def nbytes(self):
+        return sum(a.nbytes for a in (self.nodes, self.offsets, self.targets, self.lengths, self.dirs, self.twin,
+                                      self.exitedge))
+
+    def walk(self, k, d, target=-1):
+        #follows the corridor leaving cell k in direction d up to the next node
+        #returns (node cell, steps, direction of the last step, steps to target or -1 if it was not passed)
+        step, sides, isnode = self.maze.step, self.sides, self.isnode
+        n = 0
+        hit = -1
+        while True:
+            k = k + step[d]
+            n += 1
+            if k == target:
+                hit = n
+            if isnode[k]:
+                return k, n, d, hit
+            d = OTHER[sides[k]][d]
+
+    def expand(self, k, d, n):
+        #the n cells after k along the corridor that starts in direction d
+        step, sides = self.maze.step, self.sides
+        for _ in range(n):
+            k = k + step[d]
+            yield k
+            d = OTHER[sides[k]][d]
+
+    def attach(self, k, target=-1):
+        #the nodes reachable from cell k without passing another node: (node id, steps, direction out of k,
+        #direction out of the node back towards k). Also how far target is if it sits on the same corridor
+        if self.isnode[k]:
+            return [(self.nodeid(k), 0, -1, -1)], -1
+        out = []
+        direct = -1
+        w = self.sides[k]
+        for d in range(4):
+            if (w >> d) & 1:
+                end, n, last, hit = self.walk(k, d, target)
+                out.append((self.nodeid(end), n, d, OPPOSITE[last]))
+                if hit >= 0:
+                    direct = (hit, d)
+        return out, direct
+
+    def nodeid(self, k):
+        return int(np.searchsorted(self.nodes, k))
+
+    def route(self, a, b):
+        """
+        Shortest route between cells a and b (flat indices).
+        Both ends climb their stripped branches towards the core, a route that meets on the way is a
+        tree route, otherwise A* runs over the core between where the two climbs reached it.
+        Returns (length, segments) where each segment is (cell, direction, steps), or (-1, None) if
+        b cannot be reached.
+        """
+        if a == b:
+            return 0, []
+        cols = self.maze.cols
+        nodes = memoryview(self.nodes)
+        offsets, targets = memoryview(self.offsets), memoryview(self.targets)
+        lengths, dirs = memoryview(self.lengths), memoryview(self.dirs)
+        twin, exitedge = memoryview(self.twin), memoryview(self.exitedge)
+
+        sources, direct = self.attach(a, b)
+        bestlen, plan = -1, None
+        if direct != -1:
+            bestlen, plan = direct[0], ("direct", direct[1])
+
+        up = {}  #node -> (distance from a, previous node, segment from there), climbing from a
+        for u, n, d, back in sources:
+            prev, seg = -1, None if n == 0 else (a, d, n)
+            while u not in up or n < up[u][0]:
+                up[u] = (n, prev, seg)
+                e = exitedge[u]
+                if e < 0:
+                    break
+                prev, seg = u, (nodes[u], dirs[e], lengths[e])
+                n += lengths[e]
+                u = targets[e]
+        down = {}  #node -> (distance to b, next node, segment to there), climbing from b
+        for u, n, d, back in self.attach(b)[0]:
+            nxt, seg = -1, None if n == 0 else (nodes[u], back, n)
+            while u not in down or n < down[u][0]:
+                down[u] = (n, nxt, seg)
+                e = exitedge[u]
+                if e < 0:
+                    break
+                v = targets[e]
+                nxt, seg = u, (nodes[v], dirs[twin[e]], lengths[e])
+                n += lengths[e]
+                u = v
+        for x, (n, nxt, seg) in down.items():
+            if x in up and (bestlen < 0 or up[x][0] + n < bestlen):
+                bestlen, plan = up[x][0] + n, ("meet", x)
+
+        #A* over the core, from the core nodes a climbed to until one b climbed to is settled
+        bi, bj = divmod(b, cols)
+        best = {}
+        parent = {}
+        heap = []
+        for x, (n, prev, seg) in up.items():
+            if exitedge[x] < 0:
+                best[x] = n
+                parent[x] = None
+                i, j = divmod(nodes[x], cols)
+                heap.append((n + abs(i - bi) + abs(j - bj), n, x))
+        heapq.heapify(heap)
+        while heap:
+            f, g, u = heapq.heappop(heap)
+            if bestlen >= 0 and f >= bestlen:
+                break  #nothing left can beat the route already found
+            if g > best[u]:
+                continue  #stale entry
+            if u in down and (bestlen < 0 or g + down[u][0] < bestlen):
+                bestlen, plan = g + down[u][0], ("core", u)
+            for e in range(offsets[u], offsets[u + 1]):
+                v = targets[e]
+                if exitedge[v] >= 0:
+                    continue  #stripped, only reachable by the climbs
+                ng = g + lengths[e]
+                if v not in best or ng < best[v]:
+                    best[v] = ng
+                    parent[v] = (u, (nodes[u], dirs[e], lengths[e]))
+                    i, j = divmod(nodes[v], cols)
+                    heapq.heappush(heap, (ng + abs(i - bi) + abs(j - bj), ng, v))
+        if plan is None:
+            return -1, None
+        if plan[0] == "direct":
+            return bestlen, [(a, plan[1], bestlen)]
+
+        x = plan[1]
+        middle = []
+        if plan[0] == "core":
+            while parent[x] is not None:
+                x, seg = parent[x]
+                middle.append(seg)
+            middle.reverse()
+        segments = []
+        u = x
+        while u >= 0:
+            n, u, seg = up[u]
+            if seg is not None:
+                segments.append(seg)
+        segments.reverse()
+        segments.extend(middle)
+        u = plan[1]
+        while u >= 0:
+            n, u, seg = down[u]
+            if seg is not None:
+                segments.append(seg)
+        return bestlen, segments
+
+    def distance(self, a, b):
+        return self.route(a, b)[0]
+
+    def path(self, a, b):
+        #generator of the flat cell indices from a to b, corridors are only walked as it is iterated
+        length, segments = self.route(a, b)
+        if segments is None:
+            return
+        yield a
+        for k, d, n in segments:
+            yield from self.expand(k, d, n)
+
+    def patharray(self, a, b):
+        return np.fromiter(self.path(a, b), dtype=np.int64)
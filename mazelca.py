@@ -0,0 +1,83 @@
+import numpy as np
+
+from mazecore import UNSEEN
+from mazesolvers import spanningtree
+
+#A perfect maze is a tree, so the route between any two cells goes up to their lowest common ancestor
+#and back down. LCAIndex roots the tree at the start and keeps binary lifting tables: up[j][k] is the
+#2^j-th ancestor of cell k (the root is its own parent). Built once per maze with whole-array numpy
+#pointer jumping, then distances are O(log n) each and batches of pairs are answered in one call.
+#Memory is one 4 byte table per level, about log2(deepest cell) levels.
+
+
+class LCAIndex:
+
+    def __init__(self, maze):
+        self.maze = maze
+        tree = maze.tree if maze.tree is not None else spanningtree(maze)
+        if (tree == UNSEEN).any():
+            raise ValueError("Some cells cannot be reached from the start, the maze is not a single tree")
+        size = maze.size
+        dtype = np.int32 if size < 2 ** 31 else np.int64
+        self.root = maze.index(*maze.start)
+        cells = np.arange(size, dtype=dtype)
+        step = np.array(maze.step + (0,), dtype=dtype)  #the root holds ORIGIN (4), which maps to no move
+        parent = cells - step[tree]
+        del cells
+
+        #pointer jumping: hops[k] counts the steps covered by up[j][k], adding them up level by level gives depth
+        hops = np.ones(size, dtype=dtype)
+        hops[self.root] = 0
+        self.up = [parent]
+        while not (self.up[-1] == self.root).all():
+            last = self.up[-1]
+            hops += hops[last]
+            self.up.append(last[last])
+        self.depth = hops  #every cell is within 2^j steps of the root by now, so the counts are exact
+
+    @property
+    def nbytes(self):
+        return sum(table.nbytes for table in self.up) + self.depth.nbytes
+
+    def lcas(self, a, b):
+        #lowest common ancestors of a batch of pairs, a and b are arrays of flat indices
+        a = np.array(a, dtype=np.int64, copy=True).reshape(-1)
+        b = np.array(b, dtype=np.int64, copy=True).reshape(-1)
+        swap = self.depth[a] < self.depth[b]
+        a[swap], b[swap] = b[swap], a[swap].copy()
+        diff = self.depth[a] - self.depth[b]
+        for j, table in enumerate(self.up):
+            lift = ((diff >> j) & 1).astype(bool)
+            a[lift] = table[a[lift]]
+        for table in reversed(self.up):
+            ta = table[a]
+            tb = table[b]
+            apart = ta != tb
+            a[apart] = ta[apart]
+            b[apart] = tb[apart]
+        return np.where(a == b, a, self.up[0][a])
+
+    def distances(self, a, b):
+        a = np.asarray(a, dtype=np.int64).reshape(-1)
+        b = np.asarray(b, dtype=np.int64).reshape(-1)
+        return self.depth[a].astype(np.int64) + self.depth[b] - 2 * self.depth[self.lcas(a, b)].astype(np.int64)
+
+    def lca(self, a, b):
+        return int(self.lcas([a], [b])[0])
+
+    def distance(self, a, b):
+        return int(self.distances([a], [b])[0])
+
+    def path(self, a, b):
+        #the cells from a to b as an int64 array, O(log n + route length)
+        top = self.lca(a, b)
+        parent = memoryview(self.up[0])
+        first = [a]
+        while first[-1] != top:
+            first.append(parent[first[-1]])
+        second = [b]
+        while second[-1] != top:
+            second.append(parent[second[-1]])
+        second.pop()
+        second.reverse()
+        return np.array(first + second, dtype=np.int64)
@@ -0,0 +1,95 @@
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from mazegenerator_2_copy import mazegenerate
+from mazefile import savemaze
+from mazerender import writepng
+from mazesolvers import solve
+
+#Builds a pack of mazes without the GUI: count mazes for every algorithm and size, seeds seed, seed + 1, ...
+#Each maze is written as <algorithm>-<n>-<seed>.maze (see mazefile.py), plus a .png with --png.
+#Every file is written under a temporary name and renamed into place, the .maze last, so an interrupted
+#batch can be run again with the same arguments and only the unfinished mazes are built.
+#
+#   python mazepack.py packs/ --sizes 50 100 --algorithms kruskal wilson --count 500 --solve deadend --png
+
+
+def itemname(algorithm, n, seed):
+    return "%s-%d-%d" % (algorithm, n, seed)
+
+
+def finished(directory, name, png):
+    return os.path.exists(os.path.join(directory, name + ".maze")) and (
+        not png or os.path.exists(os.path.join(directory, name + ".png")))
+
+
+def makeitem(job):
+    #builds one maze and its files, returns (name, cells, seconds, cells on the route or 0)
+    directory, algorithm, n, seed, solver, png = job
+    start = time.perf_counter()
+    name = itemname(algorithm, n, seed)
+    path = os.path.join(directory, name)
+    maze = mazegenerate(n, algorithm, seed=seed, tree=solver == "tree")
+    route = solve(maze, solver).path if solver else None
+    if png:
+        writepng(path + ".png.part", maze, route)
+        os.replace(path + ".png.part", path + ".png")
+    savemaze(path + ".maze.part", maze)
+    os.replace(path + ".maze.part", path + ".maze")
+    return name, maze.size, time.perf_counter() - start, 0 if route is None else len(route)
+
+
+def makepack(directory, sizes, algorithms, count, seed=0, solver=None, png=False, workers=None, report=print):
+    """
+    Builds every maze of the pack that is not in directory yet across a process pool.
+    report is called with one line of text per finished maze and once more with the totals.
+    Returns (built, skipped, seconds, cells).
+    """
+    os.makedirs(directory, exist_ok=True)
+    jobs = []
+    skipped = 0
+    for algorithm in algorithms:
+        for n in sizes:
+            for s in range(seed, seed + count):
+                if finished(directory, itemname(algorithm, n, s), png):
+                    skipped += 1
+                else:
+                    jobs.append((directory, algorithm, n, s, solver, png))
+    began = time.perf_counter()
+    cells = 0
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(makeitem, job) for job in jobs]
+        for done, future in enumerate(as_completed(futures), 1):
+            name, size, seconds, length = future.result()
+            cells += size
+            report("%6d/%d %-30s %8.3fs%s" % (done, len(jobs), name, seconds,
+                                              " route %d" % length if solver else ""))
+    seconds = time.perf_counter() - began
+    report("built %d mazes (%d already there) in %.2fs: %.1f mazes/s, %.0f cells/s" % (
+        len(jobs), skipped, seconds, len(jobs) / seconds if seconds else 0.0, cells / seconds if seconds else 0.0))
+    return len(jobs), skipped, seconds, cells
+
+
+def main(argv=None):
+    from mazealgorithms import GENERATORS
+    from mazesolvers import SOLVERS
+    parser = argparse.ArgumentParser(description="Generate a pack of maze files, optionally solved and rendered")
+    parser.add_argument("directory")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50])
+    parser.add_argument("--algorithms", nargs="+", default=["dfs"], choices=sorted(GENERATORS))
+    parser.add_argument("--count", type=int, default=10, help="mazes per algorithm and size")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first maze, the rest count up from it")
+    parser.add_argument("--solve", choices=sorted(SOLVERS), help="solve every maze with this solver")
+    parser.add_argument("--png", action="store_true", help="also write a PNG of every maze, with the route if solved")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args(argv)
+    makepack(args.directory, args.sizes, args.algorithms, args.count, args.seed, args.solve, args.png, args.workers)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,105 @@
+from array import array
+
+import numpy as np
+
+from mazecore import DI, DJ, ORIGIN
+from mazerender import drawpath, GREEN
+
+#A route through a maze kept as its start cell and run-length encoded moves: array('B') of
+#(direction, count) byte pairs, a count never goes over 255 so long straight runs are split.
+#A winding route costs about 2 bytes per turn instead of a python list entry per cell, and the cells
+#are only produced when iterated (one at a time) or asked for as an array (all at once).
+
+
+class MazePath:
+
+    def __init__(self, maze, start, runs=None):
+        self.cols = maze.cols
+        self.step = maze.step
+        self.start = start  #flat index of the first cell
+        self.runs = array('B') if runs is None else runs
+
+    @classmethod
+    def fromindices(cls, maze, path):
+        #path is a sequence of flat indices of neighbouring cells
+        path = np.asarray(path, dtype=np.int64)
+        if len(path) == 0:
+            return None
+        moves = np.diff(path)
+        dirs = np.select([moves == maze.step[d] for d in range(4)], [0, 1, 2, 3], 0).astype(np.uint8)
+        return cls(maze, int(path[0]), encode(dirs))
+
+    @classmethod
+    def fromcame(cls, maze, came, k):
+        #walks came[] (see mazesolvers) back from k, one byte per move before compressing
+        step = maze.step
+        moves = bytearray()
+        while came[k] != ORIGIN:
+            d = came[k]
+            moves.append(d)
+            k = k - step[d]
+        return cls(maze, k, encode(np.frombuffer(moves, dtype=np.uint8)[::-1]))
+
+    def append(self, d):
+        #one more move in direction d, extends the last run when it can
+        runs = self.runs
+        if runs and runs[-2] == d and runs[-1] < 255:
+            runs[-1] += 1
+        else:
+            runs.append(d)
+            runs.append(1)
+
+    def __len__(self):
+        #number of cells, counting the start
+        return 1 + sum(self.runs[1::2])
+
+    @property
+    def nbytes(self):
+        return self.runs.itemsize * len(self.runs)
+
+    def directions(self):
+        runs = self.runs
+        for r in range(0, len(runs), 2):
+            d = runs[r]
+            for _ in range(runs[r + 1]):
+                yield d
+
+    def __iter__(self):
+        #(i, j) of every cell from the start, produced lazily
+        i, j = divmod(self.start, self.cols)
+        yield i, j
+        for d in self.directions():
+            i += DI[d]
+            j += DJ[d]
+            yield i, j
+
+    def indices(self):
+        runs = np.frombuffer(self.runs, dtype=np.uint8)
+        dirs = np.repeat(runs[0::2], runs[1::2])
+        out = np.empty(len(dirs) + 1, dtype=np.int64)
+        out[0] = self.start
+        np.cumsum(np.array(self.step, dtype=np.int64)[dirs], out=out[1:])
+        out[1:] += self.start
+        return out
+
+    def cells(self):
+        return np.column_stack(np.divmod(self.indices(), self.cols))
+
+    def draw(self, image, colour=GREEN):
+        #the whole route in one drawing call
+        return drawpath(image, self.cells(), colour)
+
+
+def encode(dirs):
+    #run-length encodes an array of direction codes into (direction, count) byte pairs
+    if len(dirs) == 0:
+        return array('B')
+    starts = np.flatnonzero(np.concatenate(([True], dirs[1:] != dirs[:-1])))
+    lengths = np.diff(np.append(starts, len(dirs)))
+    pieces = (lengths + 254) // 255  #runs longer than a byte are split into 255s and a remainder
+    counts = np.full(pieces.sum(), 255, dtype=np.int64)
+    counts[np.cumsum(pieces) - 1] = lengths - 255 * (pieces - 1)
+    out = np.empty(2 * len(counts), dtype=np.uint8)
+    out[0::2] = np.repeat(dirs[starts], pieces)
+    out[1::2] = counts
+    return array('B', out.tobytes())
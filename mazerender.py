@@ -0,0 +1,155 @@
+import struct
+import zlib
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+from mazecore import UP, DOWN, LEFT, RIGHT
+
+WHITE = (255, 255, 255)
+GREEN = (0, 255, 0)
+RED = (255, 0, 0)
+
+
+def pixels(maze):
+    #(2 rows + 1) x (2 cols + 1) uint8 grid, 255 for open pixels and 0 for walls
+    #cell (i, j) sits at pixel row 2i + 1, column 2j + 1, the pixels between cells are walls or passages
+    cells = maze.cells
+    grid = np.zeros((maze.rows * 2 + 1, maze.cols * 2 + 1), dtype=np.uint8)
+    grid[1::2, 1::2] = 255
+    grid[1::2, 2:-1:2] = np.where(cells[:, :-1] & (1 << RIGHT), 0, 255)
+    grid[2:-1:2, 1::2] = np.where(cells[:-1, :] & (1 << DOWN), 0, 255)
+    return grid
+
+
+def pixelwindow(maze, y0, y1, x0, x1):
+    #pixels(maze)[y0:y1, x0:x1] worked out from only the cells the window touches, for views of huge mazes
+    i0, i1 = max(0, (y0 - 1) // 2), min(maze.rows, (y1 - 1) // 2 + 1)
+    j0, j1 = max(0, (x0 - 1) // 2), min(maze.cols, (x1 - 1) // 2 + 1)
+    cells = np.asarray(maze.band(i0, i1))[:, j0:j1]
+    grid = np.zeros(((i1 - i0) * 2 + 1, (j1 - j0) * 2 + 1), dtype=np.uint8)
+    grid[1::2, 1::2] = 255
+    #the first row and column of the window belong to the cells' up and left walls, the rest to right and down
+    grid[1::2, 0] = np.where(cells[:, 0] & (1 << LEFT), 0, 255)
+    grid[0, 1::2] = np.where(cells[0] & (1 << UP), 0, 255)
+    grid[1::2, 2::2] = np.where(cells & (1 << RIGHT), 0, 255)
+    grid[2::2, 1::2] = np.where(cells & (1 << DOWN), 0, 255)
+    return grid[y0 - i0 * 2:y1 - i0 * 2, x0 - j0 * 2:x1 - j0 * 2]
+
+
+def render(maze):
+    grid = pixels(maze)
+    rgb = np.empty(grid.shape + (3,), dtype=np.uint8)
+    rgb[...] = grid[..., None]
+    gi, gj = maze.goal
+    si, sj = maze.start
+    rgb[gi + gi + 1, gj + gj + 1] = GREEN
+    rgb[si + si + 1, sj + sj + 1] = RED
+    return Image.fromarray(rgb, 'RGB')
+
+
+def pathpixels(cells):
+    #pixel (x, y) pairs covering the cells of a path and the passages between consecutive cells
+    cells = np.asarray(cells, dtype=np.int64).reshape(-1, 2)
+    centres = cells * 2 + 1
+    links = cells[:-1] + cells[1:] + 1
+    ij = np.concatenate((centres, links))
+    return ij[:, ::-1]
+
+
+def drawpath(image, cells, colour=GREEN):
+    #cells is a sequence or (N, 2) array of (i, j) along the path, drawn in one call
+    xy = pathpixels(cells)
+    if len(xy):
+        ImageDraw.Draw(image).point(xy.ravel().tolist(), fill=colour)
+    return image
+
+
+#Streaming PNG export, for images too big to build in memory. The image is a 2 bit palette PNG
+#written two pixel rows per maze row through one zlib stream, so only O(width) is held at a time when
+#the rows come from a generator (mazealgorithms.ellerrows) or a memory mapped maze.
+#The solution overlay needs its own pixels sorted by row, so it costs O(route length) on top.
+
+PALETTE = (0, 0, 0) + WHITE + GREEN + RED  #palette index 0 wall, 1 open, 2 route and goal, 3 start
+IDATSIZE = 1 << 16  #compressed bytes gathered before writing a chunk
+
+
+def chunk(file, kind, data):
+    file.write(struct.pack(">I", len(data)) + kind + data)
+    file.write(struct.pack(">I", zlib.crc32(kind + data) & 0xffffffff))
+
+
+def packrow(values):
+    #4 pixels per byte, first pixel in the high bits
+    width = len(values)
+    padded = np.zeros((width + 3) // 4 * 4, dtype=np.uint8)
+    padded[:width] = values
+    return (padded[0::4] << 6) | (padded[1::4] << 4) | (padded[2::4] << 2) | padded[3::4]
+
+
+def streampng(filename, rows, cols, cellrows, solution=None, start=(0, 0), goal=None):
+    """
+    Writes the maze whose wall-bit rows come from the iterable cellrows to filename as a PNG.
+    solution is optional: a MazePath, an array of flat indices or an (N, 2) array of (i, j).
+    """
+    if goal is None:
+        goal = (rows - 1, cols - 1)
+    width = cols * 2 + 1
+    overlay = None
+    if solution is not None:
+        route = solution.cells() if hasattr(solution, "cells") else np.asarray(solution, dtype=np.int64)
+        if route.ndim == 1:
+            route = np.column_stack(np.divmod(route, cols))
+        xy = pathpixels(route)
+        xy = xy[np.argsort(xy[:, 1], kind="stable")]
+        overlay = (xy[:, 0], np.searchsorted(xy[:, 1], np.arange(rows * 2 + 2)))
+
+    compressor = zlib.compressobj(6)
+    pending = []
+    pendingsize = 0
+    with open(filename, "wb") as file:
+        file.write(b"\x89PNG\r\n\x1a\n")
+        chunk(file, b"IHDR", struct.pack(">IIBBBBB", width, rows * 2 + 1, 2, 3, 0, 0, 0))
+        chunk(file, b"PLTE", bytes(PALETTE))
+
+        def emit(y, values):
+            nonlocal pendingsize
+            if overlay is not None:
+                values[overlay[0][overlay[1][y]:overlay[1][y + 1]]] = 2
+            data = compressor.compress(b"\x00" + packrow(values).tobytes())  #filter type 0 on every row
+            if data:
+                pending.append(data)
+                pendingsize += len(data)
+            if pendingsize >= IDATSIZE:
+                chunk(file, b"IDAT", b"".join(pending))
+                pending.clear()
+                pendingsize = 0
+
+        line = np.zeros(width, dtype=np.uint8)
+        below = np.zeros(width, dtype=np.uint8)
+        for i, cells in enumerate(cellrows):
+            cells = np.asarray(cells, dtype=np.uint8)
+            if i == 0:
+                line[:] = 0
+                line[1::2] = (cells & (1 << UP)) == 0
+                emit(0, line)
+            line[:] = 0
+            line[1::2] = 1
+            line[0] = (cells[0] & (1 << LEFT)) == 0
+            line[2::2] = (cells & (1 << RIGHT)) == 0
+            if i == goal[0]:
+                line[goal[1] * 2 + 1] = 2
+            if i == start[0]:
+                line[start[1] * 2 + 1] = 3
+            emit(i * 2 + 1, line)
+            below[:] = 0
+            below[1::2] = (cells & (1 << DOWN)) == 0
+            emit(i * 2 + 2, below)
+        pending.append(compressor.flush())
+        chunk(file, b"IDAT", b"".join(pending))
+        chunk(file, b"IEND", b"")
+
+
+def writepng(filename, maze, solution=None):
+    #streams maze row by row, a memory mapped maze is only paged in as it is written
+    streampng(filename, maze.rows, maze.cols, iter(maze.cells), solution, maze.start, maze.goal)
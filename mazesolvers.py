@@ -0,0 +1,306 @@
+import heapq
+from array import array
+from collections import namedtuple
+
+import numpy as np
+
+from mazecore import WALLS, OPPOSITE, UNSEEN, ORIGIN
+
+#Solvers work on a Maze and return a Solution: the route as an int64 array of flat cell indices
+#(start first, empty if the goal cannot be reached) and how many cells were expanded to find it.
+#Visited and parent state is one byte per cell: came[k] is the direction cell k was entered from,
+#UNSEEN if it has not been reached and ORIGIN for the cell the search started from.
+#Every solver also takes an optional progress(expanded, total), called about every PROGRESS expanded
+#cells. total is the number of cells, the most any search can expand.
+
+Solution = namedtuple("Solution", "path expanded")
+PROGRESS = 1 << 16
+
+SOLVERS = {}
+
+
+def register(name):
+    def wrap(func):
+        SOLVERS[name] = func
+        return func
+    return wrap
+
+
+def getsolver(name):
+    try:
+        return SOLVERS[name]
+    except KeyError:
+        raise ValueError("Unknown maze solver " + repr(name) + ", pick one of " + ", ".join(sorted(SOLVERS)))
+
+
+def solve(maze, method="bfs", progress=None):
+    return getsolver(method)(maze, progress)
+
+
+def trace(maze, came, k):
+    #follows came[] back from cell k to the cell the search started from, returned start first
+    step = maze.step
+    out = array('q', [k])
+    while came[k] != ORIGIN:
+        k = k - step[came[k]]
+        out.append(k)
+    return np.frombuffer(out, dtype=np.int64)[::-1].copy()
+
+
+def cells(maze, path):
+    #flat indices to an (N, 2) array of (i, j)
+    return np.column_stack(np.divmod(np.asarray(path, dtype=np.int64), maze.cols))
+
+
+def newcame(maze, start):
+    came = bytearray([UNSEEN]) * maze.size
+    came[start] = ORIGIN
+    return came
+
+
+def ends(maze):
+    return maze.index(*maze.start), maze.index(*maze.goal)
+
+
+def spanningtree(maze):
+    #breadth first from the start over the whole maze, the came[] array it leaves is the tree
+    view, step = maze.view, maze.step
+    start = maze.index(*maze.start)
+    tree = np.full(maze.size, UNSEEN, dtype=np.uint8)
+    came = memoryview(tree)
+    came[start] = ORIGIN
+    queue = array('q', [start])
+    head = 0
+    while head < len(queue):
+        k = queue[head]
+        head += 1
+        w = view[k]
+        for d in range(4):
+            if not (w >> d) & 1:
+                nk = k + step[d]
+                if came[nk] == UNSEEN:
+                    came[nk] = d
+                    queue.append(nk)
+    return tree
+
+
+def treepath(maze, k):
+    #route from the start to cell k using maze.tree, no searching, O(route length)
+    return trace(maze, memoryview(maze.tree), k)
+
+
+@register("tree")
+def tree(maze, progress=None):
+    #walks the spanning tree recorded at generation time up from the goal, too quick to need progress
+    if maze.tree is None:
+        raise ValueError("This maze has no spanning tree, generate it with tree=True")
+    path = treepath(maze, maze.index(*maze.goal))
+    return Solution(path, len(path))
+
+
+@register("dfs")
+def dfs(maze, progress=None):
+    #depth first search, cheap per cell but explores whole side branches before backing out
+    view, step = maze.view, maze.step
+    start, goal = ends(maze)
+    came = newcame(maze, start)
+    stack = [start]
+    expanded = 0
+    report = PROGRESS if progress is not None else -1
+    while stack:
+        k = stack.pop()
+        expanded += 1
+        if expanded == report:
+            progress(expanded, maze.size)
+            report += PROGRESS
+        if k == goal:
+            return Solution(trace(maze, came, k), expanded)
+        w = view[k]
+        for d in range(4):
+            if not (w >> d) & 1:
+                nk = k + step[d]
+                if came[nk] == UNSEEN:
+                    came[nk] = d
+                    stack.append(nk)
+    return Solution(np.empty(0, dtype=np.int64), expanded)
+
+
+@register("bfs")
+def bfs(maze, progress=None):
+    #breadth first search, shortest route in any maze, expands every cell closer than the goal
+    view, step = maze.view, maze.step
+    start, goal = ends(maze)
+    came = newcame(maze, start)
+    queue = array('q', [start])
+    head = 0
+    report = PROGRESS if progress is not None else -1
+    while head < len(queue):
+        k = queue[head]
+        head += 1
+        if head == report:
+            progress(head, maze.size)
+            report += PROGRESS
+        if k == goal:
+            return Solution(trace(maze, came, k), head)
+        w = view[k]
+        for d in range(4):
+            if not (w >> d) & 1:
+                nk = k + step[d]
+                if came[nk] == UNSEEN:
+                    came[nk] = d
+                    queue.append(nk)
+    return Solution(np.empty(0, dtype=np.int64), head)
+
+
+@register("astar")
+def astar(maze, progress=None):
+    #A* with a heapq frontier and manhattan distance to the goal, shortest route in any maze
+    view, step, cols = maze.view, maze.step, maze.cols
+    start, goal = ends(maze)
+    gi, gj = maze.goal
+    came = newcame(maze, start)
+    closed = bytearray(maze.size)
+    cost = array('i', [-1]) * maze.size  #best known distance from the start
+    cost[start] = 0
+    heap = [(0, start)]
+    expanded = 0
+    report = PROGRESS if progress is not None else -1
+    while heap:
+        f, k = heapq.heappop(heap)
+        if closed[k]:
+            continue  #stale entry, k was already reached more cheaply
+        closed[k] = 1
+        expanded += 1
+        if expanded == report:
+            progress(expanded, maze.size)
+            report += PROGRESS
+        if k == goal:
+            return Solution(trace(maze, came, k), expanded)
+        g = cost[k] + 1
+        w = view[k]
+        for d in range(4):
+            if not (w >> d) & 1:
+                nk = k + step[d]
+                if not closed[nk] and (cost[nk] < 0 or g < cost[nk]):
+                    cost[nk] = g
+                    came[nk] = d
+                    i, j = divmod(nk, cols)
+                    heapq.heappush(heap, (g + abs(gi - i) + abs(gj - j), nk))
+    return Solution(np.empty(0, dtype=np.int64), expanded)
+
+
+@register("bidirectional")
+def bidirectional(maze, progress=None):
+    #breadth first from both ends, always growing the smaller frontier, until the two meet
+    #explores about half the radius of bfs, route is shortest in a perfect maze (there is only one)
+    view, step = maze.view, maze.step
+    start, goal = ends(maze)
+    camea = newcame(maze, start)
+    cameb = newcame(maze, goal)
+    fronta = [start]
+    frontb = [goal]
+    expanded = 0
+    report = PROGRESS if progress is not None else -1
+    meet = start if start == goal else -1
+    while meet < 0 and fronta and frontb:
+        if len(fronta) <= len(frontb):
+            front, came, other = fronta, camea, cameb
+        else:
+            front, came, other = frontb, cameb, camea
+        nextfront = []
+        for k in front:
+            expanded += 1
+            if expanded == report:
+                progress(expanded, maze.size)
+                report += PROGRESS
+            w = view[k]
+            for d in range(4):
+                if not (w >> d) & 1:
+                    nk = k + step[d]
+                    if came[nk] == UNSEEN:
+                        came[nk] = d
+                        if other[nk] != UNSEEN:
+                            meet = nk
+                            break
+                        nextfront.append(nk)
+            if meet >= 0:
+                break
+        if front is fronta:
+            fronta = nextfront
+        else:
+            frontb = nextfront
+    if meet < 0:
+        return Solution(np.empty(0, dtype=np.int64), expanded)
+    return Solution(np.concatenate((trace(maze, camea, meet), trace(maze, cameb, meet)[::-1][1:])), expanded)
+
+
+#lookup tables indexed by a cell's open-side bits
+OPENCOUNT = np.array([bin(b).count("1") for b in range(16)], dtype=np.int8)
+LOWESTOPEN = [(b & -b).bit_length() - 1 if b else 0 for b in range(16)]
+CLOSE = [WALLS ^ (1 << OPPOSITE[d]) for d in range(4)]  #clears the side facing back at the cell we came from
+LOWESTOPEN_ARRAY = np.array(LOWESTOPEN, dtype=np.int8)
+SMALLPASS = 64  #below this many dead ends a numpy pass costs more than filling them one by one
+
+
+@register("deadend")
+def deadend(maze, progress=None):
+    #dead-end filling for perfect mazes: every cell with one open side (other than start and goal) is
+    #filled in, which can turn its neighbour into a new dead end. While there are many dead ends each
+    #pass fills all of them with a few numpy operations per direction. Once only a few long side
+    #branches are left, each one is chased to its junction in a plain loop instead, since one numpy
+    #pass per cell of a long corridor would cost far more. Either way the work adds up to O(cells).
+    #Whatever is left unfilled is the route, which is then walked once from the start.
+    start, goal = ends(maze)
+    steps = maze.step
+    sides = ~maze.cells.reshape(-1) & WALLS  #open sides, a working copy that gets filled in
+    count = OPENCOUNT[sides]
+    dead = np.flatnonzero(count == 1)
+    dead = dead[(dead != start) & (dead != goal)]
+    expanded = 0
+    while len(dead) >= SMALLPASS:
+        if progress is not None:
+            progress(expanded, maze.size)
+        expanded += len(dead)
+        d = LOWESTOPEN_ARRAY[sides[dead]]
+        sides[dead] = 0
+        count[dead] = 0
+        nbs = []
+        for dd in range(4):
+            #within one direction the neighbours are all different, so plain fancy indexing is safe
+            nb = dead[d == dd] + steps[dd]
+            sides[nb] &= CLOSE[dd]
+            count[nb] -= 1
+            nbs.append(nb)
+        nb = np.concatenate(nbs)
+        dead = nb[(count[nb] == 1) & (nb != start) & (nb != goal)]
+        #a junction losing two branches in the same pass shows up twice, sorting is far cheaper than np.unique here
+        dead.sort()
+        dead = dead[np.concatenate(([True], dead[1:] != dead[:-1]))]
+
+    view = memoryview(sides)
+    counts = memoryview(count)
+    for k in dead.tolist():
+        while view[k]:
+            d = LOWESTOPEN[view[k]]
+            nb = k + steps[d]
+            view[nb] &= CLOSE[d]
+            counts[nb] -= 1
+            view[k] = 0
+            counts[k] = 0
+            expanded += 1
+            if counts[nb] != 1 or nb == start or nb == goal:
+                break
+            k = nb
+
+    out = array('q', [start])
+    k, prev = start, -1
+    while k != goal and len(out) <= maze.size:
+        w = view[k]
+        for d in range(4):
+            if (w >> d) & 1 and k + steps[d] != prev:
+                prev, k = k, k + steps[d]
+                out.append(k)
+                break
+        else:
+            return Solution(np.empty(0, dtype=np.int64), expanded)
+    return Solution(np.frombuffer(out, dtype=np.int64).copy(), expanded + len(out))
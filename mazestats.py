@@ -0,0 +1,113 @@
+import argparse
+import csv
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from mazecore import UP, DOWN, LEFT, RIGHT, WALLS
+from mazefile import loadmaze
+from mazesolvers import solve
+
+#Quality metrics for choosing generators and sizes, worked out from whole-array counts over the wall bits:
+#   degree0..degree4: cells with that many open sides (the branching distribution)
+#   deadends, junctions: degree 1 cells and cells with 3 or more open sides
+#   straights, turns: corridor cells (degree 2) that go straight through or turn a corner
+#   river: cells per corridor between junctions and dead ends, long winding corridors give a high river
+#   straightrun: mean length of straight runs in cells, how far the maze goes without turning
+#   solution, tortuosity: cells on the start to goal route, and that divided by the manhattan distance + 1
+#
+#   python mazestats.py packs/ --output stats.csv   (or stats.npz)
+
+FIELDS = ("rows", "cols", "deadends", "junctions", "degree0", "degree1", "degree2", "degree3", "degree4",
+          "straights", "turns", "river", "straightrun", "solution", "tortuosity")
+
+
+def analyse(maze, solver="deadend"):
+    #every metric in FIELDS for one maze, as a dict. The default solver finds the one route of a perfect maze
+    #fastest, use "bfs" for the shortest route of mazes with loops
+    sides = ~maze.cells & WALLS
+    up, down, left, right = (sides >> UP & 1, sides >> DOWN & 1, sides >> LEFT & 1, sides >> RIGHT & 1)
+    degree = (up + down + left + right).reshape(-1)
+    counts = np.bincount(degree, minlength=5)
+    straight = (sides == (1 << UP | 1 << DOWN)) | (sides == (1 << LEFT | 1 << RIGHT))
+    straights = int(np.count_nonzero(straight))
+
+    #every corridor has two ends, each end is an open side of a cell that is not a corridor cell
+    ends = int(degree[degree != 2].sum())
+    river = float(counts[2] / (ends / 2) if ends else counts[2])
+
+    #a straight run starts at a cell open to the right (or down) but not to the left (or up)
+    links = int(right.sum()) + int(down.sum())
+    runs = int(np.count_nonzero(right & ~left & 1)) + int(np.count_nonzero(down & ~up & 1))
+    straightrun = (links + runs) / runs if runs else 1.0
+
+    length = len(solve(maze, solver).path)
+    distance = abs(maze.goal[0] - maze.start[0]) + abs(maze.goal[1] - maze.start[1]) + 1
+    return {"rows": maze.rows, "cols": maze.cols, "deadends": int(counts[1]), "junctions": int(counts[3] + counts[4]),
+            "degree0": int(counts[0]), "degree1": int(counts[1]), "degree2": int(counts[2]),
+            "degree3": int(counts[3]), "degree4": int(counts[4]), "straights": straights,
+            "turns": int(counts[2]) - straights, "river": river, "straightrun": straightrun,
+            "solution": length, "tortuosity": length / distance if length else 0.0}
+
+
+def analysefile(job):
+    filename, solver = job
+    maze = loadmaze(filename)
+    stats = analyse(maze, solver)
+    stats["algorithm"] = maze.algorithm or ""
+    stats["seed"] = maze.seed
+    return stats
+
+
+def analysedirectory(directory, solver="deadend", workers=None):
+    """
+    Analyses every .maze file in directory across a process pool.
+    Returns a dict of columns: "name" (the file name), "algorithm" and "seed" (-1 when there is none)
+    plus one numpy array per name in FIELDS, all in file name order.
+    """
+    names = sorted(name for name in os.listdir(directory) if name.endswith(".maze"))
+    jobs = [(os.path.join(directory, name), solver) for name in names]
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        rows = list(pool.map(analysefile, jobs, chunksize=max(1, len(jobs) // (workers * 4))))
+    columns = {"name": np.array(names, dtype=str), "algorithm": np.array([r["algorithm"] for r in rows], dtype=str),
+               "seed": np.array([-1 if r["seed"] is None else r["seed"] for r in rows], dtype=np.int64)}
+    for field in FIELDS:
+        columns[field] = np.array([r[field] for r in rows], dtype=type(rows[0][field]) if rows else np.int64)
+    return columns
+
+
+def save(filename, columns):
+    #.npz keeps the arrays as they are, anything else is written as CSV
+    if filename.endswith(".npz"):
+        np.savez(filename, **columns)
+        return
+    names = list(columns)
+    with open(filename, "w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(names)
+        writer.writerows(zip(*(columns[name].tolist() for name in names)))
+
+
+def main(argv=None):
+    from mazesolvers import SOLVERS
+    parser = argparse.ArgumentParser(description="Quality metrics for a directory of .maze files")
+    parser.add_argument("directory")
+    parser.add_argument("--output", default="mazestats.csv", help="CSV file, or .npz for numpy arrays")
+    parser.add_argument("--solver", default="deadend", choices=sorted(SOLVERS))
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    columns = analysedirectory(args.directory, args.solver, args.workers)
+    seconds = time.perf_counter() - start
+    save(args.output, columns)
+    print("%d mazes in %.2fs, written to %s" % (len(columns["name"]), seconds, args.output))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
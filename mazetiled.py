@@ -0,0 +1,64 @@
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from mazecore import Maze, DOWN, RIGHT
+from mazealgorithms import getgenerator
+
+#Giant mazes are cut into tiles that are generated in parallel worker processes.
+#Each tile is a perfect maze on its own, then one passage is opened across the border of every
+#pair of tiles that are neighbours in a random spanning tree over the tile grid.
+#A tree of trees joined by single passages is still a tree, so the result is one perfect maze.
+
+
+def maketile(job):
+    #runs in a worker process, returns the tile's wall bits
+    rows, cols, algorithm, seed = job
+    tile = Maze(rows, cols)
+    getgenerator(algorithm)(tile, random.Random(seed))
+    return tile.cells
+
+
+def tiledgenerate(rows, cols=None, algorithm="kruskal", tile=512, seed=None, workers=None):
+    """
+    Generates a rows x cols maze as tile x tile pieces in a ProcessPoolExecutor.
+    Every tile gets its own RNG stream spawned from seed, so the same seed and tile size give
+    the same maze whatever the number of workers.
+    """
+    if cols is None:
+        cols = rows
+    if seed is None:
+        seed = random.getrandbits(64)
+    elif not isinstance(seed, int) or seed < 0:
+        #SeedSequence only takes non-negative ints, other seeds random.Random accepts go through it first
+        seed = random.Random(seed).getrandbits(128)
+    rowedges = list(range(0, rows, tile)) + [rows]
+    coledges = list(range(0, cols, tile)) + [cols]
+    tilerows = len(rowedges) - 1
+    tilecols = len(coledges) - 1
+    streams = np.random.SeedSequence(seed).spawn(tilerows * tilecols + 1)
+
+    jobs = []
+    for ti in range(tilerows):
+        for tj in range(tilecols):
+            jobs.append((rowedges[ti + 1] - rowedges[ti], coledges[tj + 1] - coledges[tj], algorithm,
+                         int(streams[ti * tilecols + tj].generate_state(1, np.uint64)[0])))
+
+    maze = Maze(rows, cols)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for t, cells in enumerate(pool.map(maketile, jobs)):
+            ti, tj = divmod(t, tilecols)
+            maze.cells[rowedges[ti]:rowedges[ti + 1], coledges[tj]:coledges[tj + 1]] = cells
+
+    #spanning tree over the tiles themselves, then one random door per tree edge
+    rng = random.Random(int(streams[-1].generate_state(1, np.uint64)[0]))
+    tree = Maze(tilerows, tilecols)
+    getgenerator("kruskal")(tree, rng)
+    for ti in range(tilerows):
+        for tj in range(tilecols):
+            if tree.isopen(ti, tj, RIGHT):
+                maze.carve(rng.randrange(rowedges[ti], rowedges[ti + 1]), coledges[tj + 1] - 1, RIGHT)
+            if tree.isopen(ti, tj, DOWN):
+                maze.carve(rowedges[ti + 1] - 1, rng.randrange(coledges[tj], coledges[tj + 1]), DOWN)
+    return maze
@@ -0,0 +1,177 @@
+import math
+from collections import OrderedDict
+
+import numpy as np
+from PIL import Image
+
+from mazerender import pixelwindow, pathpixels, WHITE, GREEN, RED
+
+#What the GUI shows of a maze, without ever building the whole image: a 10000 x 10000 maze is a
+#20001 x 20001 pixel image, 1.2 GB as RGB. Pixels are in the same (2 rows + 1) x (2 cols + 1) grid as
+#mazerender.render and come in two layers:
+#   the maze, as a mipmap pyramid of greyscale tiles: a level 0 tile is TILE x TILE image pixels straight
+#   from mazerender.pixelwindow, a level L tile covers 2^L times that each way and is the 2 x 2 average of
+#   the four tiles below it. Tiles are built the first time they are looked at and kept in an LRU cache,
+#   tiles only built on the way to a higher level go in at the cold end so they are dropped first.
+#   The maze never changes under the view, so this layer is never rebuilt.
+#   the overlay, whatever has been painted on top (trail, search, route), as palette indices in TILE x TILE
+#   chunks that only exist where something was painted. Every level has its own chunks so a zoomed out
+#   view still shows a one pixel route, a coarse pixel shows the last colour painted anywhere under it.
+#   The overlay is what has been drawn, so it is not part of BUDGET and is never dropped, only chunks that
+#   have been rubbed out completely are freed. It costs at most 4/3 of a byte per image pixel (overlaybytes),
+#   about 530 MB for a route or search that reaches every part of a 10000 x 10000 maze.
+
+TILE = 256
+BUDGET = 128 << 20  #bytes of maze tiles kept
+GREY = (100, 100, 100)
+COLOURS = (None, WHITE, GREEN, RED, GREY, (0, 0, 0))  #overlay palette, index 0 (None) is nothing painted
+SHADES = np.array([(0, 0, 0)] + list(COLOURS[1:]), dtype=np.uint8)
+
+
+class MazeView:
+
+    def __init__(self, maze, tile=TILE, budget=BUDGET):
+        self.maze = maze
+        self.tilesize = tile
+        self.shift = tile.bit_length() - 1  #tile has to be a power of two
+        self.budget = budget
+        self.height = maze.rows * 2 + 1
+        self.width = maze.cols * 2 + 1
+        self.top = max(0, math.ceil(math.log2(max(self.width, self.height) / tile)))  #one tile covers all
+        self.tiles = OrderedDict()  #(level, row, column) -> greyscale uint8 array, least recently used first
+        self.nbytes = 0
+        self.overlay = [{} for _ in range(self.top + 1)]  #per level: (row, column) of a tile -> palette indices
+        self.overlaybytes = 0
+        gi, gj = maze.goal
+        si, sj = maze.start
+        self.paint([(gj * 2 + 1, gi * 2 + 1)], GREEN)  #same markers as render, start last
+        self.paint([(sj * 2 + 1, si * 2 + 1)], RED)
+
+    def paint(self, points, colour):
+        #points is a sequence or (N, 2) array of (x, y) image pixels, all given colour in one pass per level.
+        #None rubs the paint out and shows the maze again.
+        #Each level sorts its points once by (chunk, pixel in the chunk), which also drops the repeats that
+        #halving gives, so every chunk is written from one slice and the next level starts from fewer points
+        xy = np.asarray(points, dtype=np.int64).reshape(-1, 2)
+        if len(xy) == 0:
+            return
+        index = COLOURS.index(colour)
+        shift, mask = self.shift, self.tilesize - 1
+        x, y = xy[:, 0], xy[:, 1]
+        for level, chunks in enumerate(self.overlay):
+            if level:
+                x, y = x >> 1, y >> 1
+            stride = (self.width >> shift + level) + 1
+            keys = (((y >> shift) * stride + (x >> shift)) << 2 * shift) | (y & mask) << shift | x & mask
+            keys.sort()
+            keys = keys[np.concatenate(([True], keys[1:] != keys[:-1]))]  #far cheaper than np.unique here
+            chunk = keys >> 2 * shift
+            edges = np.flatnonzero(chunk[1:] != chunk[:-1]) + 1
+            for a, b in zip([0] + edges.tolist(), edges.tolist() + [len(keys)]):
+                where = divmod(int(chunk[a]), stride)
+                here = keys[a:b]
+                block = chunks.get(where)
+                if block is None:
+                    if index == 0:
+                        continue  #nothing to rub out
+                    block = chunks[where] = np.zeros((self.tilesize, self.tilesize), dtype=np.uint8)
+                    self.overlaybytes += block.nbytes
+                block[here >> shift & mask, here & mask] = index
+                if index == 0 and not block.any():
+                    del chunks[where]
+                    self.overlaybytes -= block.nbytes
+            ty, tx = np.divmod(chunk, stride)
+            x = tx << shift | keys & mask
+            y = ty << shift | keys >> shift & mask
+
+    def drawpath(self, cells, colour=GREEN):
+        #cells is a sequence or (N, 2) array of (i, j) along a route, like mazerender.drawpath
+        self.paint(pathpixels(cells), colour)
+
+    def tile(self, level, ty, tx, keep=True):
+        #greyscale array of one maze tile, smaller than TILE x TILE along the right and bottom edges of the image.
+        #keep=False is for tiles wanted only to build the level above, they are the first to go from the cache
+        key = (level, ty, tx)
+        tile = self.tiles.get(key)
+        if tile is not None:
+            if keep:
+                self.tiles.move_to_end(key)
+            return tile
+        if level == 0:
+            size = self.tilesize
+            y0, x0 = ty * size, tx * size
+            tile = pixelwindow(self.maze, y0, min(y0 + size, self.height), x0, min(x0 + size, self.width))
+        else:
+            tile = self.shrink(level, ty, tx)
+        self.tiles[key] = tile
+        if not keep:
+            self.tiles.move_to_end(key, last=False)
+        self.nbytes += tile.nbytes
+        while self.nbytes > self.budget and len(self.tiles) > 1:
+            self.nbytes -= self.tiles.popitem(last=False)[1].nbytes
+        return tile
+
+    def shrink(self, level, ty, tx):
+        #averages the up to four tiles one level down into one, an odd last row or column is doubled up
+        rows = []
+        for cy in (ty * 2, ty * 2 + 1):
+            if cy << self.shift + level - 1 >= self.height:
+                continue
+            row = [self.tile(level - 1, cy, cx, False) for cx in (tx * 2, tx * 2 + 1)
+                   if cx << self.shift + level - 1 < self.width]
+            rows.append(np.concatenate(row, axis=1))
+        block = np.concatenate(rows, axis=0).astype(np.uint16)
+        if block.shape[0] % 2:
+            block = np.concatenate((block, block[-1:]), axis=0)
+        if block.shape[1] % 2:
+            block = np.concatenate((block, block[:, -1:]), axis=1)
+        total = block[0::2, 0::2] + block[1::2, 0::2] + block[0::2, 1::2] + block[1::2, 1::2]
+        return ((total + 2) >> 2).astype(np.uint8)
+
+    def level(self, scale):
+        #the pyramid level to draw from at scale screen pixels per image pixel
+        if scale >= 1:
+            return 0
+        return min(self.top, int(math.floor(math.log2(1 / scale))))
+
+    def render(self, cx, cy, scale, width, height):
+        """
+        A width x height PIL image of the view centred on image point (cx, cy) at scale screen pixels
+        per image pixel. Only the tiles it overlaps are looked at, only the visible part of each is coloured
+        and scaled.
+        """
+        out = Image.new("RGB", (width, height))
+        level = self.level(scale)
+        factor = 1 << level  #image pixels per tile pixel
+        step = scale * factor  #screen pixels per tile pixel
+        span = self.tilesize * factor  #image pixels per tile
+        left = cx - width / 2 / scale  #image point at the left and top of the screen
+        top = cy - height / 2 / scale
+        tx0, tx1 = max(0, int(left // span)), min((self.width - 1) // span, int((left + width / scale) // span))
+        ty0, ty1 = max(0, int(top // span)), min((self.height - 1) // span, int((top + height / scale) // span))
+        for ty in range(ty0, ty1 + 1):
+            for tx in range(tx0, tx1 + 1):
+                tile = self.tile(level, ty, tx)
+                h, w = tile.shape[:2]
+                #screen position of the tile's corner, then the tile pixels that land on screen
+                sx, sy = (tx * span - left) * scale, (ty * span - top) * scale
+                a = max(0, int((0 - sx) // step))
+                b = min(w, int(math.ceil((width - sx) / step)))
+                c = max(0, int((0 - sy) // step))
+                d = min(h, int(math.ceil((height - sy) / step)))
+                if a >= b or c >= d:
+                    continue
+                x0, x1 = round(sx + a * step), round(sx + b * step)
+                y0, y1 = round(sy + c * step), round(sy + d * step)
+                if x1 <= x0 or y1 <= y0:
+                    continue
+                rgb = np.repeat(tile[c:d, a:b, None], 3, axis=2)
+                chunk = self.overlay[level].get((ty, tx))
+                if chunk is not None:
+                    chunk = chunk[c:d, a:b]
+                    painted = chunk != 0
+                    rgb[painted] = SHADES[chunk[painted]]
+                piece = Image.fromarray(rgb, "RGB")
+                piece = piece.resize((x1 - x0, y1 - y0), Image.NEAREST if step >= 1 else Image.BOX)
+                out.paste(piece, (x0, y0))
+        return out
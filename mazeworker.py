@@ -0,0 +1,84 @@
+import multiprocessing
+import queue
+import time
+
+from mazegenerator_2_copy import mazegenerate
+from something_copy import solvepath
+
+#Slow work for the GUI (making or solving a big maze) runs in its own process so the window never waits.
+#The process reports through a queue the GUI polls from root.after: ("progress", text) as it goes,
+#then ("done", result) or ("error", text). Cancelling a Job ends the process there and then, work that is
+#done on the Tk thread a bit at a time (the animated solver) checks a plain Token between frames instead.
+
+
+class Token:
+    #handed to whatever is running, the one that started it calls cancel() and the work checks cancelled
+
+    def __init__(self):
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+def run(messages, func, args):
+    try:
+        messages.put(("done", func(lambda text: messages.put(("progress", text)), *args)))
+    except Exception as error:
+        messages.put(("error", repr(error)))
+
+
+class Job(Token):
+    """
+    Runs func(progress, *args) in a new process, func and args have to be picklable.
+    progress(text) sends a message back, func's return value is sent back when it finishes.
+    """
+
+    def __init__(self, func, *args):
+        super().__init__()
+        self.text = "working"  #the last progress message
+        self.started = time.perf_counter()
+        self.messages = multiprocessing.Queue()
+        self.process = multiprocessing.Process(target=run, args=(self.messages, func, args), daemon=True)
+        self.process.start()
+
+    @property
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    def cancel(self):
+        super().cancel()
+        if self.process.is_alive():
+            self.process.terminate()
+        self.process.join()
+
+    def poll(self):
+        #the messages that have arrived, without waiting. A process that ended without a word counts as an error
+        alive = self.process.is_alive()
+        out = []
+        while True:
+            try:
+                out.append(self.messages.get_nowait())
+            except queue.Empty:
+                break
+        for kind, value in out:
+            if kind == "progress":
+                self.text = value
+        if not alive and not out:
+            out.append(("error", "the worker process stopped with exit code " + str(self.process.exitcode)))
+        return out
+
+
+def percent(progress, text):
+    #turns the (done, total) counts of the generators and solvers into a progress message
+    return lambda done, total: progress("%s %d%%" % (text, 100 * done // total))
+
+
+def generatework(progress, n, seed, cache):
+    progress("generating")
+    return mazegenerate(n, seed=seed, cache=cache, tree=True, progress=percent(progress, "generating"))
+
+
+def solvework(progress, maze, method):
+    progress("solving")
+    return solvepath(maze, method, percent(progress, "solving"))